@@ -5,7 +5,7 @@ import sys
 from datetime import timedelta
 import os
 
-def create_app(config_name='default'):
+def create_app(config_name='default', init_services=True):
     app = Flask(__name__, 
                 static_folder='../static', 
                 template_folder='../templates')
@@ -23,7 +23,6 @@ def create_app(config_name='default'):
     # Set session configuration
     app.secret_key = app.config['SECRET_KEY']
     app.config['PERMANENT_SESSION_LIFETIME'] = timedelta(hours=1)
-    app.config['SESSION_TYPE'] = 'filesystem'
     
     # Register blueprints
     from app.routes.main import main_bp
@@ -36,13 +35,22 @@ def create_app(config_name='default'):
     app.register_blueprint(audio_bp, url_prefix='/audio')
     app.register_blueprint(api_bp, url_prefix='/api')
     
+    # Async variants of the I/O-bound API endpoints, beside the sync ones
+    if app.config['ASYNC_API_ENABLED']:
+        from app.routes.api_async import api_async_bp
+        app.register_blueprint(api_async_bp, url_prefix='/api/async')
+    
     # Create required directories
     os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
     os.makedirs('audio', exist_ok=True)
     
-    # Initialize database
-    from app.services.database import init_db
-    init_db(app)
+    # Load token encodings once for the whole process
+    from app.services.tokenizer import init_tokenizer
+    init_tokenizer(app)
+    
+    # Per-process services; a pre-forking server defers these to each worker
+    if init_services:
+        init_app_services(app)
     
     # Configure CORS headers globally
     @app.after_request
@@ -53,7 +61,50 @@ def create_app(config_name='default'):
         return response
     
     return app
+
+def init_app_services(app):
+    """
+    Create the clients, pools, caches and stores that must not be shared
+    across processes: the OpenAI HTTP pool, the MongoDB client, the SQLite
+    audio index, the job worker threads and the async API's event loop.
+    Called by create_app, or by a pre-forking server in each worker after fork.
+    """
+    # Create the shared OpenAI client
+    from app.services.openai_client import init_openai_client
+    init_openai_client(app)
+    
+    # Set up the TTS result cache under the audio directory
+    from app.services.tts_cache import init_tts_cache
+    init_tts_cache(app)
     
+    # Initialize database
+    from app.services.database import init_db
+    init_db(app)
+    
+    # Translation cache (persisted in the database when available)
+    from app.services.translation import init_translation_cache
+    init_translation_cache(app)
+    
+    # GridFS store for audio kept in the database
+    from app.services.gridfs_store import init_gridfs
+    init_gridfs(app)
+    
+    # Rebuild the chunk ID -> audio file index from disk and the database
+    from app.services.audio_index import init_audio_index
+    init_audio_index(app)
+    
+    # Keep session data on the server instead of in the cookie
+    from app.services.session_store import init_session
+    init_session(app)
+    
+    # Start the background job workers (may use the database)
+    from app.services.jobs import init_jobs
+    init_jobs(app)
+    
+    # Event loop and async clients for the async API, when enabled
+    from app.services.async_runtime import init_async_runtime
+    init_async_runtime(app)
+
 def configure_logging(app):
     """Configure logging for the application"""
     logging.basicConfig(
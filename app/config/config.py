@@ -15,6 +15,13 @@ class Config:
     MONGODB_PASSWORD = os.getenv('MONGODB_PASSWORD', 'password')
     MONGODB_DB = os.getenv('MONGODB_DB', 'podcast_maker_db')
     
+    # GridFS bucket holding imported/migrated audio files
+    GRIDFS_AUDIO_BUCKET = 'audio'
+    
+    # Server-side session storage; the cookie only carries a session ID
+    SESSION_TYPE = os.getenv('SESSION_TYPE', 'filesystem')  # 'filesystem' or 'mongodb'
+    SESSION_FILE_DIR = os.getenv('SESSION_FILE_DIR', 'flask_session')
+    
     # OpenAI API configuration
     @staticmethod
     def load_openai_key():
@@ -27,9 +34,80 @@ class Config:
     
     OPENAI_API_KEY = load_openai_key.__func__()
     
+    # OpenAI client settings (one pooled client is shared by all requests)
+    OPENAI_BASE_URL = os.getenv('OPENAI_BASE_URL')  # e.g. a local fake server for testing
+    OPENAI_MAX_CONNECTIONS = int(os.getenv('OPENAI_MAX_CONNECTIONS', 20))
+    OPENAI_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv('OPENAI_MAX_KEEPALIVE_CONNECTIONS', 10))
+    OPENAI_KEEPALIVE_EXPIRY = float(os.getenv('OPENAI_KEEPALIVE_EXPIRY', 30.0))
+    OPENAI_CONNECT_TIMEOUT = float(os.getenv('OPENAI_CONNECT_TIMEOUT', 5.0))
+    OPENAI_TIMEOUT = float(os.getenv('OPENAI_TIMEOUT', 120.0))
+    OPENAI_MAX_RETRIES = int(os.getenv('OPENAI_MAX_RETRIES', 2))
+    
+    # Parallel synthesis settings (keep OPENAI_MAX_CONNECTIONS >= workers)
+    SYNTHESIS_WORKERS = int(os.getenv('SYNTHESIS_WORKERS', 8))
+    # TTS_REQUESTS_PER_MINUTE is for the whole server: each of its SERVER_PROCESSES
+    # worker processes (set by gunicorn.conf.py) gets an equal share
+    TTS_REQUESTS_PER_MINUTE = int(os.getenv('TTS_REQUESTS_PER_MINUTE', 50))  # 0 = unlimited
+    SERVER_PROCESSES = int(os.getenv('SERVER_PROCESSES', 1))
+    
+    # Async API under /api/async: requests share one event loop per process,
+    # an AsyncOpenAI client and an async MongoDB client (needs asgiref)
+    ASYNC_API_ENABLED = os.getenv('ASYNC_API_ENABLED', 'false').lower() == 'true'
+    ASYNC_OPENAI_MAX_CONNECTIONS = int(os.getenv('ASYNC_OPENAI_MAX_CONNECTIONS', 100))
+    ASYNC_MAX_CONCURRENCY = int(os.getenv('ASYNC_MAX_CONCURRENCY', 100))  # in-flight calls per request
+    
     # Audio processing settings
     MAX_TOKEN_LENGTH = 2000
     
+    # Background audio generation jobs
+    JOB_STORE = os.getenv('JOB_STORE', 'memory')  # 'memory' or 'mongodb'
+    JOB_WORKERS = int(os.getenv('JOB_WORKERS', 4))
+    JOB_TTL_SECONDS = int(os.getenv('JOB_TTL_SECONDS', 24 * 60 * 60))
+    
+    # Job event streams: how often to re-read jobs run by other processes,
+    # and how often to send a keepalive comment when nothing happens
+    JOB_EVENTS_POLL_SECONDS = float(os.getenv('JOB_EVENTS_POLL_SECONDS', 2))
+    JOB_EVENTS_HEARTBEAT_SECONDS = float(os.getenv('JOB_EVENTS_HEARTBEAT_SECONDS', 15))
+    
+    # Bytes per write when streaming synthesized audio to the client
+    STREAM_CHUNK_SIZE = 8192
+    
+    # TTS result cache (identical text/voice/tone/language reuses audio)
+    TTS_CACHE_ENABLED = os.getenv('TTS_CACHE_ENABLED', 'true').lower() == 'true'
+    TTS_CACHE_DIR = os.path.join('audio', 'tts_cache')
+    TTS_CACHE_MAX_BYTES = int(os.getenv('TTS_CACHE_MAX_BYTES', 1024 * 1024 * 1024))  # 1 GB
+    TTS_CACHE_MAX_ENTRIES = int(os.getenv('TTS_CACHE_MAX_ENTRIES', 0))  # 0 = no entry limit
+    
+    # Translation cache (in memory, plus MongoDB with a TTL when available)
+    TRANSLATION_CACHE_ENABLED = os.getenv('TRANSLATION_CACHE_ENABLED', 'true').lower() == 'true'
+    TRANSLATION_CACHE_MAX_ENTRIES = int(os.getenv('TRANSLATION_CACHE_MAX_ENTRIES', 1000))
+    TRANSLATION_CACHE_TTL_SECONDS = int(os.getenv('TRANSLATION_CACHE_TTL_SECONDS', 30 * 24 * 3600))
+    
+    # Long texts are translated as segments of at most this many tokens, concurrently
+    TRANSLATION_SEGMENT_TOKENS = int(os.getenv('TRANSLATION_SEGMENT_TOKENS', 1000))
+    TRANSLATION_WORKERS = int(os.getenv('TRANSLATION_WORKERS', 4))
+    
+    # Persistent chunk ID -> audio file index
+    AUDIO_INDEX_PATH = os.path.join('audio', 'audio_index.sqlite3')
+    # Scan the audio directory and podcast records into the index at startup
+    # (gunicorn does this once in the master instead of in every worker)
+    AUDIO_INDEX_REBUILD_ON_START = os.getenv('AUDIO_INDEX_REBUILD_ON_START', 'true').lower() == 'true'
+    
+    # Duplicate reuse: /api/process_chunk serves the audio of an earlier chunk whose
+    # text is the same apart from case, spacing and punctuation (same voice, tone
+    # and language); LSH buckets only narrow down the candidates
+    NEAR_DUP_ENABLED = os.getenv('NEAR_DUP_ENABLED', 'false').lower() == 'true'
+    
+    # How long /podcast/stats results are reused before recomputing
+    STATS_CACHE_SECONDS = int(os.getenv('STATS_CACHE_SECONDS', 60))
+    
+    # Browser cache lifetime for UUID-named audio, which is never rewritten
+    AUDIO_CACHE_MAX_AGE = int(os.getenv('AUDIO_CACHE_MAX_AGE', 365 * 24 * 3600))
+    
+    # Token counting settings
+    TOKENIZER_MODELS = ["gpt-4o"]  # Encodings loaded at startup
+    TOKENIZER_THREADS = int(os.getenv('TOKENIZER_THREADS', 8))
+    
     # Voice and tone settings
     AVAILABLE_VOICES = [
         "alloy", "echo", "fable", "onyx", "nova", "shimmer"
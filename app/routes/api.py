@@ -1,10 +1,21 @@
-from flask import Blueprint, request, jsonify, session, current_app
+from flask import Blueprint, request, jsonify, session, current_app, Response, stream_with_context
+import os
 import logging
 import json
+import time
 import uuid
 from datetime import datetime
 from app.services.audio_processor import AudioProcessor
-from app.services.database import save_podcast
+from app.services.database import save_podcast, get_podcast_collection
+from app.services.near_duplicates import find_same_text, signature, signature_fields
+from app.services.tokenizer import count_tokens_batch, get_encoding
+from app.services.openai_client import get_openai_client, get_tts_rate_limiter
+from app.services.tts_cache import get_tts_cache
+from app.services.jobs import get_job_manager, FINISHED_STATUSES
+from app.utils.http import sse_event
+from app.services.audio_index import get_audio_index
+from app.services.translation import Translator, get_translation_cache, join_segments
+from app.services.pipeline import translate_and_synthesize
 
 # Get logger
 logger = logging.getLogger(__name__)
@@ -12,6 +23,207 @@ logger = logging.getLogger(__name__)
 # Create API blueprint
 api_bp = Blueprint('api', __name__)
 
+# Job event stream: ID of the final event, and the reconnect delay sent with it
+DONE_EVENT_ID = 'done'
+DONE_RETRY_MS = 60 * 60 * 1000
+
+# Error returned for an invalid max_tokens
+MAX_TOKENS_ERROR = "max_tokens must be a positive integer"
+
+def _parse_max_tokens(value, default):
+    """A request's max_tokens: default when absent, None when not a positive integer"""
+    if value is None or value == '':
+        return default
+    if isinstance(value, bool):
+        return None
+    try:
+        max_tokens = int(value)
+    except (TypeError, ValueError):
+        return None
+    return max_tokens if max_tokens > 0 else None
+
+def _parse_synthesis_params():
+    """
+    Read and validate text, voice, tone and metadata from a JSON or form
+    request. max_tokens is None when the request gave an invalid value.
+    """
+    if request.is_json:
+        data = request.get_json()
+        params = {
+            'text': data.get('text', ''),
+            'voice': data.get('voice', 'nova'),
+            'tone': data.get('tone', 'neutral'),
+            'is_chinese': data.get('is_chinese', False),
+            'source_url': data.get('source_url', ''),
+            'title': data.get('title', 'Untitled Podcast'),
+            'max_tokens': _parse_max_tokens(data.get('max_tokens'), current_app.config['MAX_TOKEN_LENGTH'])
+        }
+    else:
+        # Form fields, or query parameters for GET requests such as <audio src>
+        params = {
+            'text': request.values.get('text', ''),
+            'voice': request.values.get('voice', 'nova'),
+            'tone': request.values.get('tone', 'neutral'),
+            'is_chinese': request.values.get('is_chinese', 'false').lower() == 'true',
+            'source_url': request.values.get('source_url', ''),
+            'title': request.values.get('title', 'Untitled Podcast'),
+            'max_tokens': _parse_max_tokens(request.values.get('max_tokens'), current_app.config['MAX_TOKEN_LENGTH'])
+        }
+    
+    # Validate voice
+    if params['voice'] not in current_app.config['AVAILABLE_VOICES']:
+        params['voice'] = 'nova'  # Default to 'nova' if invalid
+    
+    # Validate tone
+    if params['tone'] not in current_app.config['AVAILABLE_TONES']:
+        params['tone'] = 'neutral'  # Default to 'neutral' if invalid
+    
+    return params
+
+def _get_audio_processor():
+    """Build an AudioProcessor on the shared OpenAI client, TTS cache, rate limiter and audio index"""
+    return AudioProcessor(
+        get_openai_client(),
+        current_app.config['TONE_INSTRUCTIONS'],
+        get_tts_cache(),
+        get_tts_rate_limiter(),
+        get_audio_index()
+    )
+
+def _reuse_near_duplicate_audio(text, voice, tone, is_chinese, chunk_id, sig=None):
+    """
+    Look for an earlier chunk with the same text (ignoring case, spacing and
+    punctuation) and the same voice settings whose audio is still on disk.
+    If found, index its file under chunk_id and return a generate_audio-style
+    result; otherwise None. Imported records are never reused: their voice
+    and tone are placeholders.
+    """
+    collection = get_podcast_collection()
+    audio_index = get_audio_index()
+    if not current_app.config['NEAR_DUP_ENABLED'] or collection is None or audio_index is None:
+        return None
+    
+    matches = find_same_text(
+        collection, text,
+        query={'voice': voice, 'tone': tone, 'is_chinese': is_chinese, 'imported_at': {'$exists': False}},
+        sig=sig
+    )
+    for match_id in matches:
+        audio_path = audio_index.lookup(match_id)
+        if audio_path and os.path.exists(audio_path):
+            filename = os.path.basename(audio_path)
+            audio_index.add(chunk_id, filename)
+            logger.info(f"Reusing audio of chunk {match_id} with the same text for chunk {chunk_id}")
+            return {
+                "success": True,
+                "filename": filename,
+                "cached": True,
+                "near_duplicate_of": match_id
+            }
+    return None
+
+def _start_session_podcast(params):
+    """Start recording a podcast in the session, unless one is already in progress"""
+    # Make session permanent
+    session.permanent = True
+    
+    # Get session data or initialize new
+    if 'podcast_data' not in session:
+        session['podcast_data'] = {
+            'id': str(uuid.uuid4()),
+            'title': params['title'],
+            'voice': params['voice'],
+            'tone': params['tone'],
+            'is_chinese': params['is_chinese'],
+            'source_url': params['source_url'],
+            'chunks': [],
+            'created_at': datetime.now().isoformat()
+        }
+
+def _add_session_chunk(chunk_id, text, filename, sig=None):
+    """
+    Add a processed chunk to the session podcast. Returns the podcast to
+    save when this is its first chunk, otherwise None. The saved chunk is
+    signed with sig, the signature already computed for its text.
+    """
+    session['podcast_data']['chunks'].append({
+        'chunk_id': chunk_id,
+        'text': text,
+        'filename': filename,
+        'processed': True
+    })
+    session.modified = True
+    
+    if len(session['podcast_data']['chunks']) != 1:
+        return None
+    podcast_data = session['podcast_data'].copy()
+    podcast_data['chunks'] = [dict(podcast_data['chunks'][0], **signature_fields(text, sig))]
+    podcast_data['created_at'] = datetime.now()
+    return podcast_data
+
+def _chunk_response(chunk_id, text, result):
+    """JSON response for a chunk added to the session podcast"""
+    return jsonify({
+        "success": True,
+        "chunk_id": chunk_id,
+        "audio_url": f"/audio/{result['filename']}",
+        "text": text,
+        "cached": result.get('cached', False),
+        "near_duplicate_of": result.get('near_duplicate_of'),
+        "total_chunks": len(session['podcast_data']['chunks'])
+    })
+
+def _synthesis_chunks(texts, chunk_ids, results):
+    """Per-chunk response entries for a batch of generate_audio results"""
+    chunks = []
+    for index, (chunk_text, chunk_id, result) in enumerate(zip(texts, chunk_ids, results)):
+        chunk = {
+            'index': index,
+            'text': chunk_text,
+            'success': result['success']
+        }
+        if result['success']:
+            chunk['chunk_id'] = chunk_id
+            chunk['filename'] = result['filename']
+            chunk['audio_url'] = f"/audio/{result['filename']}"
+            chunk['cached'] = result.get('cached', False)
+        else:
+            chunk['error'] = result['error']
+        chunks.append(chunk)
+    return chunks
+
+def _synthesized_podcast(params, chunks):
+    """Podcast record holding the chunks that were synthesized successfully"""
+    return {
+        'id': str(uuid.uuid4()),
+        'title': params['title'],
+        'voice': params['voice'],
+        'tone': params['tone'],
+        'is_chinese': params['is_chinese'],
+        'source_url': params['source_url'],
+        'chunks': [
+            {
+                'chunk_id': chunk['chunk_id'],
+                'text': chunk['text'],
+                'filename': chunk['filename'],
+                'processed': True
+            }
+            for chunk in chunks if chunk['success']
+        ],
+        'created_at': datetime.now()
+    }
+
+def _synthesis_response(chunks, elapsed):
+    """JSON response for a batch synthesis; 500 only when every chunk failed"""
+    failed = sum(1 for chunk in chunks if not chunk['success'])
+    return jsonify({
+        "success": failed == 0,
+        "chunks": chunks,
+        "total_chunks": len(chunks),
+        "failed_chunks": failed,
+        "elapsed_seconds": round(elapsed, 3)
+    }), 200 if failed < len(chunks) else 500
+
 @api_bp.route('/process_chunk', methods=['POST'])
 def process_chunk():
     """
@@ -25,92 +237,385 @@ def process_chunk():
         logger.info(f"Content-Type: {request.headers.get('Content-Type')}")
         
         # Parse request parameters
-        if request.is_json:
-            data = request.get_json()
-            text = data.get('text', '')
-            voice = data.get('voice', 'nova')
-            tone = data.get('tone', 'neutral')
-            is_chinese = data.get('is_chinese', False)
-            source_url = data.get('source_url', '')
-            title = data.get('title', 'Untitled Podcast')
-        else:
-            text = request.form.get('text', '')
-            voice = request.form.get('voice', 'nova')
-            tone = request.form.get('tone', 'neutral')
-            is_chinese = request.form.get('is_chinese', 'false').lower() == 'true'
-            source_url = request.form.get('source_url', '')
-            title = request.form.get('title', 'Untitled Podcast')
+        params = _parse_synthesis_params()
+        text = params['text']
+        voice = params['voice']
+        tone = params['tone']
+        is_chinese = params['is_chinese']
         
         # Input validation
         if not text:
             return jsonify({"error": "No text provided"}), 400
         
-        # Validate voice
-        if voice not in current_app.config['AVAILABLE_VOICES']:
-            voice = 'nova'  # Default to 'nova' if invalid
-        
-        # Validate tone
-        if tone not in current_app.config['AVAILABLE_TONES']:
-            tone = 'neutral'  # Default to 'neutral' if invalid
-            
-        # Make session permanent
-        session.permanent = True
-        
-        # Get session data or initialize new
-        if 'podcast_data' not in session:
-            session['podcast_data'] = {
-                'id': str(uuid.uuid4()),
-                'title': title,
-                'voice': voice,
-                'tone': tone,
-                'is_chinese': is_chinese,
-                'source_url': source_url,
-                'chunks': [],
-                'created_at': datetime.now().isoformat()
-            }
+        _start_session_podcast(params)
         
         # Process the chunk
-        processor = AudioProcessor(
-            current_app.config['OPENAI_API_KEY'],
-            current_app.config['TONE_INSTRUCTIONS']
-        )
+        processor = _get_audio_processor()
         
-        # Generate audio for the chunk
-        result = processor.generate_audio(text, voice, tone, is_chinese)
+        # Generate audio for the chunk, unless a near-identical chunk already has some
+        chunk_id = str(uuid.uuid4())
+        sig = signature(text)
+        result = _reuse_near_duplicate_audio(text, voice, tone, is_chinese, chunk_id, sig)
+        if result is None:
+            result = processor.generate_audio(text, voice, tone, is_chinese, chunk_id)
         
         if not result['success']:
             return jsonify({"error": result['error']}), 500
         
-        # Create chunk data
+        # Save to database if this is the first chunk
+        podcast_data = _add_session_chunk(chunk_id, text, result['filename'], sig)
+        if podcast_data is not None:
+            save_podcast(podcast_data)
+        
+        return _chunk_response(chunk_id, text, result)
+        
+    except Exception as e:
+        logger.error(f"Error processing chunk: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+@api_bp.route('/stream_chunk', methods=['GET', 'POST'])
+def stream_chunk():
+    """
+    Endpoint to synthesize a single chunk and stream the MP3 as it is generated.
+    The audio is saved to disk at the same time; its URL is returned in the
+    X-Audio-Url header so the client can replay it without re-synthesis.
+    """
+    try:
+        params = _parse_synthesis_params()
+        
+        # Input validation
+        if not params['text']:
+            return jsonify({"error": "No text provided"}), 400
+        
+        processor = _get_audio_processor()
         chunk_id = str(uuid.uuid4())
-        chunk_data = {
-            'chunk_id': chunk_id,
-            'text': text,
-            'filename': result['filename'],
-            'processed': True
+        result = processor.stream_audio(
+            params['text'],
+            params['voice'],
+            params['tone'],
+            params['is_chinese'],
+            chunk_size=current_app.config['STREAM_CHUNK_SIZE'],
+            chunk_id=chunk_id
+        )
+        
+        podcast_data = {
+            'id': str(uuid.uuid4()),
+            'title': params['title'],
+            'voice': params['voice'],
+            'tone': params['tone'],
+            'is_chinese': params['is_chinese'],
+            'source_url': params['source_url'],
+            'chunks': [{
+                'chunk_id': chunk_id,
+                'text': params['text'],
+                'filename': result['filename'],
+                'processed': True
+            }]
         }
         
-        # Add chunk to session data
-        session['podcast_data']['chunks'].append(chunk_data)
-        session.modified = True
+        def generate():
+            try:
+                yield from result['stream']
+            finally:
+                # Only record the podcast once the whole file is on disk, which is
+                # also the case when the client disconnected and writing finished
+                if os.path.exists(result['path']):
+                    podcast_data['created_at'] = datetime.now()
+                    save_podcast(podcast_data)
+        
+        response = Response(stream_with_context(generate()), mimetype='audio/mpeg')
+        response.headers['X-Chunk-Id'] = chunk_id
+        response.headers['X-Audio-Url'] = f"/audio/{result['filename']}"
+        response.headers['X-Audio-Cached'] = str(result['cached']).lower()
+        response.headers['Cache-Control'] = 'no-store'
+        response.headers['Access-Control-Expose-Headers'] = 'X-Chunk-Id, X-Audio-Url, X-Audio-Cached'
+        return response
         
-        # Save to database if this is the first chunk
-        if len(session['podcast_data']['chunks']) == 1:
-            podcast_data = session['podcast_data'].copy()
-            podcast_data['created_at'] = datetime.now()
-            save_podcast(podcast_data)
+    except Exception as e:
+        logger.error(f"Error streaming chunk: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+@api_bp.route('/synthesize_text', methods=['POST'])
+def synthesize_text():
+    """
+    Endpoint to chunk a full text and synthesize all chunks in parallel.
+    Results are returned in chunk order.
+    """
+    try:
+        params = _parse_synthesis_params()
+        
+        # Input validation
+        if not params['text']:
+            return jsonify({"error": "No text provided"}), 400
+        if params['max_tokens'] is None:
+            return jsonify({"error": MAX_TOKENS_ERROR}), 400
+        
+        start_time = time.monotonic()
+        processor = _get_audio_processor()
+        
+        # Chunk the text and synthesize every chunk concurrently
+        texts = processor.chunk_text(params['text'], params['max_tokens'])
+        chunk_ids = [str(uuid.uuid4()) for _ in texts]
+        results = processor.generate_audio_batch(
+            texts,
+            params['voice'],
+            params['tone'],
+            params['is_chinese'],
+            max_workers=current_app.config['SYNTHESIS_WORKERS'],
+            chunk_ids=chunk_ids
+        )
+        
+        chunks = _synthesis_chunks(texts, chunk_ids, results)
+        
+        elapsed = time.monotonic() - start_time
+        failed = sum(1 for chunk in chunks if not chunk['success'])
+        logger.info(f"Synthesized {len(chunks) - failed}/{len(chunks)} chunks in {elapsed:.2f}s")
+        
+        # Save the podcast with the chunks that succeeded
+        if failed < len(chunks):
+            save_podcast(_synthesized_podcast(params, chunks))
+        
+        return _synthesis_response(chunks, elapsed)
+        
+    except Exception as e:
+        logger.error(f"Error synthesizing text: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+@api_bp.route('/translate_and_synthesize', methods=['POST'])
+def translate_and_synthesize_text():
+    """
+    Endpoint to chunk a text, translate each chunk and synthesize the
+    translation, with translation of later chunks overlapping synthesis of
+    earlier ones. Streams one JSON line per chunk, in order, as soon as its
+    audio is ready, then a final summary line.
+    """
+    try:
+        params = _parse_synthesis_params()
+        if request.is_json:
+            target_language = request.get_json().get('target_language', 'Chinese')
+        else:
+            target_language = request.values.get('target_language', 'Chinese')
+        
+        # Input validation
+        if not params['text']:
+            return jsonify({"error": "No text provided"}), 400
+        if params['max_tokens'] is None:
+            return jsonify({"error": MAX_TOKENS_ERROR}), 400
+        
+        processor = _get_audio_processor()
+        translator = Translator(get_openai_client(), get_translation_cache())
+        texts = processor.chunk_text(params['text'], params['max_tokens'])
+        translate_workers = current_app.config['TRANSLATION_WORKERS']
+        synthesis_workers = current_app.config['SYNTHESIS_WORKERS']
+        
+        def save(chunks):
+            """Save the podcast with the chunks that succeeded, if any"""
+            if any(chunk['success'] for chunk in chunks):
+                save_podcast({
+                    'id': str(uuid.uuid4()),
+                    'title': params['title'],
+                    'voice': params['voice'],
+                    'tone': params['tone'],
+                    'is_chinese': True,
+                    'source_url': params['source_url'],
+                    'chunks': [
+                        {
+                            'chunk_id': chunk['chunk_id'],
+                            'text': chunk['translated_text'],
+                            'original_text': chunk['text'],
+                            'filename': chunk['filename'],
+                            'processed': True
+                        }
+                        for chunk in chunks if chunk['success']
+                    ],
+                    'created_at': datetime.now()
+                })
+        
+        def generate():
+            start_time = time.monotonic()
+            chunks = []
+            # On a client disconnect the pipeline hands over the chunks whose
+            # speech requests were already running, once they finish
+            pipeline = translate_and_synthesize(processor, translator, texts, params['voice'], params['tone'],
+                                                target_language, translate_workers, synthesis_workers,
+                                                on_abandon=chunks.extend)
+            try:
+                for chunk in pipeline:
+                    chunks.append(chunk)
+                    yield json.dumps(chunk, ensure_ascii=False) + "\n"
+            finally:
+                # Also when the client disconnects: the audio of every chunk
+                # synthesized so far is on disk and paid for
+                pipeline.close()
+                save(chunks)
+            
+            elapsed = time.monotonic() - start_time
+            failed = sum(1 for chunk in chunks if not chunk['success'])
+            logger.info(f"Translated and synthesized {len(chunks) - failed}/{len(chunks)} chunks in {elapsed:.2f}s")
+            
+            yield json.dumps({
+                "done": True,
+                "success": failed == 0,
+                "total_chunks": len(chunks),
+                "failed_chunks": failed,
+                "elapsed_seconds": round(elapsed, 3)
+            }) + "\n"
+        
+        response = Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+        response.headers['Cache-Control'] = 'no-store'
+        return response
+        
+    except Exception as e:
+        logger.error(f"Error translating and synthesizing text: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+@api_bp.route('/jobs', methods=['POST'])
+def submit_job():
+    """
+    Endpoint to queue audio generation in the background.
+    Returns a job ID right away; poll /api/jobs/<job_id> for progress.
+    """
+    try:
+        params = _parse_synthesis_params()
+        
+        # Input validation
+        if not params['text']:
+            return jsonify({"error": "No text provided"}), 400
+        if params['max_tokens'] is None:
+            return jsonify({"error": MAX_TOKENS_ERROR}), 400
+        
+        processor = _get_audio_processor()
+        texts = processor.chunk_text(params['text'], params['max_tokens'])
+        
+        job_id = get_job_manager().submit(
+            processor,
+            texts,
+            params['voice'],
+            params['tone'],
+            params['is_chinese'],
+            title=params['title'],
+            source_url=params['source_url']
+        )
         
-        # Return success response
         return jsonify({
             "success": True,
-            "chunk_id": chunk_id,
-            "audio_url": f"/audio/{result['filename']}",
-            "text": text,
-            "total_chunks": len(session['podcast_data']['chunks'])
-        })
+            "job_id": job_id,
+            "status": "queued",
+            "total_chunks": len(texts),
+            "status_url": f"/api/jobs/{job_id}",
+            "events_url": f"/api/jobs/{job_id}/events"
+        }), 202
         
     except Exception as e:
-        logger.error(f"Error processing chunk: {str(e)}")
+        logger.error(f"Error submitting job: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+@api_bp.route('/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """
+    Get job status with per-chunk progress and results
+    """
+    try:
+        job = get_job_manager().get(job_id)
+        if job is None:
+            return jsonify({"error": "Job not found"}), 404
+        
+        # Format datetime objects
+        for field in ('created_at', 'updated_at'):
+            if isinstance(job.get(field), datetime):
+                job[field] = job[field].isoformat()
+        for chunk in job['chunks']:
+            if isinstance(chunk.get('finished_at'), datetime):
+                chunk['finished_at'] = chunk['finished_at'].isoformat()
+        
+        return jsonify(job)
+        
+    except Exception as e:
+        logger.error(f"Error retrieving job {job_id}: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+@api_bp.route('/jobs/<job_id>/events', methods=['GET'])
+def job_events(job_id):
+    """
+    Server-Sent Events stream of a job's progress. Sends a 'chunk' (or
+    'chunk_failed') event as each chunk finishes, with its index, audio URL,
+    text and timing, then a 'done' event with the final status.
+    
+    Chunks finish out of order, so each event ID is a hex bitmap of the
+    chunk indexes sent so far; a reconnecting EventSource sends it back as
+    Last-Event-ID and only receives the chunks it missed. After 'done' (ID
+    'done') a reconnect gets 204, which tells EventSource to stop.
+    """
+    try:
+        last_event_id = request.headers.get('Last-Event-ID', '')
+        if last_event_id == DONE_EVENT_ID:
+            return Response(status=204)
+        
+        manager = get_job_manager()
+        if manager.get(job_id) is None:
+            return jsonify({"error": "Job not found"}), 404
+        
+        poll_seconds = current_app.config['JOB_EVENTS_POLL_SECONDS']
+        heartbeat_seconds = current_app.config['JOB_EVENTS_HEARTBEAT_SECONDS']
+        try:
+            sent_mask = max(0, int(last_event_id, 16)) if last_event_id else 0
+        except ValueError:
+            sent_mask = 0
+        
+        def generate():
+            mask = sent_mask  # Bit i is set once chunk i was sent
+            version = 0
+            last_sent = time.monotonic()
+            while True:
+                job = manager.get(job_id)
+                if job is None:
+                    yield sse_event('error', {"error": "Job expired"})
+                    return
+                
+                for chunk in job['chunks']:
+                    if mask >> chunk['index'] & 1 or chunk['status'] not in ('done', 'failed'):
+                        continue
+                    mask |= 1 << chunk['index']
+                    payload = {
+                        "index": chunk['index'],
+                        "text": chunk['text'],
+                        "duration_seconds": chunk.get('duration_seconds'),
+                        "elapsed_seconds": round((chunk['finished_at'] - job['created_at']).total_seconds(), 3)
+                                           if chunk.get('finished_at') else None
+                    }
+                    if chunk['status'] == 'done':
+                        payload.update(chunk_id=chunk['chunk_id'], audio_url=chunk['audio_url'],
+                                       cached=chunk.get('cached', False))
+                        yield sse_event('chunk', payload, event_id=format(mask, 'x'))
+                    else:
+                        payload['error'] = chunk.get('error')
+                        yield sse_event('chunk_failed', payload, event_id=format(mask, 'x'))
+                    last_sent = time.monotonic()
+                
+                if job['status'] in FINISHED_STATUSES:
+                    yield sse_event('done', {
+                        "status": job['status'],
+                        "total_chunks": job['total_chunks'],
+                        "completed_chunks": job['completed_chunks'],
+                        "failed_chunks": job['failed_chunks'],
+                        "elapsed_seconds": round((job['updated_at'] - job['created_at']).total_seconds(), 3)
+                    }, event_id=DONE_EVENT_ID, retry=DONE_RETRY_MS)
+                    return
+                
+                # Wake on local chunk completion, or re-read after poll_seconds
+                # for jobs run by other worker processes
+                version = manager.wait_for_update(version, poll_seconds)
+                if time.monotonic() - last_sent >= heartbeat_seconds:
+                    yield ": keepalive\n\n"
+                    last_sent = time.monotonic()
+        
+        response = Response(stream_with_context(generate()), mimetype='text/event-stream')
+        response.headers['Cache-Control'] = 'no-cache'
+        response.headers['X-Accel-Buffering'] = 'no'  # Don't let a reverse proxy buffer events
+        return response
+        
+    except Exception as e:
+        logger.error(f"Error streaming events for job {job_id}: {str(e)}")
         return jsonify({"error": str(e)}), 500
 
 @api_bp.route('/chunk_text_only', methods=['POST'])
@@ -123,19 +628,20 @@ def chunk_text_only():
         if request.is_json:
             data = request.get_json()
             text = data.get('text', '')
-            max_tokens = data.get('max_tokens', current_app.config['MAX_TOKEN_LENGTH'])
+            max_tokens = _parse_max_tokens(data.get('max_tokens'), current_app.config['MAX_TOKEN_LENGTH'])
         else:
             text = request.form.get('text', '')
-            max_tokens_str = request.form.get('max_tokens', str(current_app.config['MAX_TOKEN_LENGTH']))
-            max_tokens = int(max_tokens_str) if max_tokens_str.isdigit() else current_app.config['MAX_TOKEN_LENGTH']
+            max_tokens = _parse_max_tokens(request.form.get('max_tokens'), current_app.config['MAX_TOKEN_LENGTH'])
         
         # Input validation
         if not text:
             return jsonify({"error": "No text provided"}), 400
+        if max_tokens is None:
+            return jsonify({"error": MAX_TOKENS_ERROR}), 400
         
-        # Initialize audio processor
+        # Initialize audio processor (chunking only, no API calls)
         processor = AudioProcessor(
-            current_app.config['OPENAI_API_KEY'],
+            None,
             current_app.config['TONE_INSTRUCTIONS']
         )
         
@@ -158,6 +664,38 @@ def chunk_text_only():
         logger.error(f"Error chunking text: {str(e)}")
         return jsonify({"error": str(e)}), 500
 
+@api_bp.route('/count_tokens', methods=['POST'])
+def count_tokens():
+    """
+    Endpoint to count tokens for a batch of strings
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        texts = data.get('texts', [])
+        model = data.get('model', 'gpt-4o')
+        
+        # Input validation
+        if not isinstance(texts, list) or not all(isinstance(text, str) for text in texts):
+            return jsonify({"error": "texts must be a list of strings"}), 400
+        if not isinstance(model, str):
+            return jsonify({"error": "model must be a string"}), 400
+        try:
+            get_encoding(model)
+        except KeyError:
+            return jsonify({"error": f"Unknown model: {model}"}), 400
+        
+        counts = count_tokens_batch(texts, model, current_app.config['TOKENIZER_THREADS'])
+        
+        return jsonify({
+            "success": True,
+            "counts": counts,
+            "total": sum(counts)
+        })
+        
+    except Exception as e:
+        logger.error(f"Error counting tokens: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
 @api_bp.route('/get_next_text_chunk', methods=['POST'])
 def get_next_text_chunk():
     """
@@ -221,52 +759,93 @@ def get_all_processed_chunks():
         logger.error(f"Error retrieving processed chunks: {str(e)}")
         return jsonify({"error": str(e)}), 500
 
+def _parse_translation_params():
+    """
+    Read text, target language and segment size from a JSON or form request.
+    The segment size is None when the request gave an invalid max_tokens.
+    """
+    default = current_app.config['TRANSLATION_SEGMENT_TOKENS']
+    if request.is_json:
+        data = request.get_json()
+        return (data.get('text', ''),
+                data.get('target_language', 'Chinese'),
+                _parse_max_tokens(data.get('max_tokens'), default))
+    return (request.form.get('text', ''),
+            request.form.get('target_language', 'Chinese'),
+            _parse_max_tokens(request.form.get('max_tokens'), default))
+
+def _translation_response(text, target_language, segments, results, start_time):
+    """Reassemble translated segments in order and build the JSON response"""
+    translated_text = join_segments(text, segments, [translation for translation, _ in results])
+    cached_segments = sum(1 for _, cached in results if cached)
+    logger.info(f"Translated {len(segments)} segments ({cached_segments} cached) "
+                f"in {time.monotonic() - start_time:.2f}s")
+    
+    return jsonify({
+        "success": True,
+        "original_text": text,
+        "translated_text": translated_text,
+        "target_language": target_language,
+        "segments": len(segments),
+        "cached_segments": cached_segments,
+        "cached": cached_segments == len(segments)
+    })
+
 @api_bp.route('/translate_text', methods=['POST'])
 def translate_text():
     """
     Endpoint to translate text using OpenAI API
     """
     try:
-        # Parse request parameters
-        if request.is_json:
-            data = request.get_json()
-            text = data.get('text', '')
-            target_language = data.get('target_language', 'Chinese')
-        else:
-            text = request.form.get('text', '')
-            target_language = request.form.get('target_language', 'Chinese')
+        text, target_language, max_tokens = _parse_translation_params()
         
         # Input validation
         if not text:
             return jsonify({"error": "No text provided"}), 400
+        if max_tokens is None:
+            return jsonify({"error": MAX_TOKENS_ERROR}), 400
         
-        # Create OpenAI client
-        from openai import OpenAI
-        client = OpenAI(api_key=current_app.config['OPENAI_API_KEY'])
-        
-        # Translate text
-        response = client.chat.completions.create(
-            model="gpt-4o",
-            messages=[
-                {"role": "system", "content": f"You are a translator. Translate the following text to {target_language}. Preserve the meaning, tone, and style of the original text."},
-                {"role": "user", "content": text}
-            ]
-        )
+        # Split long text into segments, translate them concurrently (cached
+        # segments are free) and reassemble them in order
+        start_time = time.monotonic()
+        translator = Translator(get_openai_client(), get_translation_cache())
+        segments = AudioProcessor(None, current_app.config['TONE_INSTRUCTIONS']).segment_text(
+            text, max_tokens)
+        results = translator.translate_segments(
+            segments, target_language, max_workers=current_app.config['TRANSLATION_WORKERS'])
         
-        translated_text = response.choices[0].message.content
-        
-        # Return success response
-        return jsonify({
-            "success": True,
-            "original_text": text,
-            "translated_text": translated_text,
-            "target_language": target_language
-        })
+        return _translation_response(text, target_language, segments, results, start_time)
         
     except Exception as e:
         logger.error(f"Error translating text: {str(e)}")
         return jsonify({"error": str(e)}), 500
 
+@api_bp.route('/tts_cache_stats', methods=['GET'])
+def tts_cache_stats():
+    """
+    Get TTS cache hit/miss counters and usage
+    """
+    cache = get_tts_cache()
+    if cache is None:
+        return jsonify({"enabled": False})
+    
+    stats = cache.stats()
+    stats['enabled'] = True
+    return jsonify(stats)
+
+@api_bp.route('/translation_cache_stats', methods=['GET'])
+def translation_cache_stats():
+    """
+    Get translation cache hit/miss counters and usage
+    """
+    cache = get_translation_cache()
+    if cache is None:
+        return jsonify({"enabled": False})
+    
+    stats = cache.stats()
+    stats['enabled'] = True
+    return jsonify(stats)
+
 @api_bp.route('/test_connection', methods=['GET', 'OPTIONS'])
 def test_connection():
     """
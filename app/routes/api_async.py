@@ -0,0 +1,107 @@
+from flask import Blueprint, jsonify, current_app
+import logging
+import time
+import uuid
+from app.routes.api import (
+    _parse_synthesis_params, _parse_translation_params,
+    _synthesis_chunks, _synthesized_podcast, _synthesis_response, _translation_response,
+    MAX_TOKENS_ERROR
+)
+from app.services.audio_processor import AsyncAudioProcessor
+from app.services.async_runtime import run_async, get_async_openai_client, save_podcast_async
+from app.services.openai_client import get_tts_rate_limiter
+from app.services.tts_cache import get_tts_cache
+from app.services.audio_index import get_audio_index
+from app.services.translation import AsyncTranslator, get_translation_cache
+
+# Get logger
+logger = logging.getLogger(__name__)
+
+# Async variants of the batch /api endpoints, registered under /api/async
+# when ASYNC_API_ENABLED is set. Under gunicorn's gthread workers each request
+# still holds a thread, so only endpoints that fan out into many OpenAI calls
+# are worth it: one thread waits while the calls run concurrently as coroutines
+# on the process-wide event loop (see async_runtime). Request parsing and
+# responses are shared with the sync blueprint.
+api_async_bp = Blueprint('api_async', __name__)
+
+def _get_async_audio_processor():
+    """Build an AsyncAudioProcessor on the shared AsyncOpenAI client, TTS cache, rate limiter and audio index"""
+    return AsyncAudioProcessor(
+        get_async_openai_client(),
+        current_app.config['TONE_INSTRUCTIONS'],
+        get_tts_cache(),
+        get_tts_rate_limiter(),
+        get_audio_index()
+    )
+
+@api_async_bp.route('/synthesize_text', methods=['POST'])
+async def synthesize_text():
+    """
+    Async variant of /api/synthesize_text: chunk a full text and synthesize
+    every chunk concurrently, up to ASYNC_MAX_CONCURRENCY requests in flight
+    """
+    try:
+        params = _parse_synthesis_params()
+        
+        # Input validation
+        if not params['text']:
+            return jsonify({"error": "No text provided"}), 400
+        if params['max_tokens'] is None:
+            return jsonify({"error": MAX_TOKENS_ERROR}), 400
+        
+        start_time = time.monotonic()
+        processor = _get_async_audio_processor()
+        texts = processor.chunk_text(params['text'], params['max_tokens'])
+        chunk_ids = [str(uuid.uuid4()) for _ in texts]
+        results = await run_async(processor.generate_audio_batch(
+            texts,
+            params['voice'],
+            params['tone'],
+            params['is_chinese'],
+            max_concurrency=current_app.config['ASYNC_MAX_CONCURRENCY'],
+            chunk_ids=chunk_ids
+        ))
+        chunks = _synthesis_chunks(texts, chunk_ids, results)
+        
+        elapsed = time.monotonic() - start_time
+        failed = sum(1 for chunk in chunks if not chunk['success'])
+        logger.info(f"Synthesized {len(chunks) - failed}/{len(chunks)} chunks in {elapsed:.2f}s (async)")
+        
+        # Save the podcast with the chunks that succeeded
+        if failed < len(chunks):
+            await run_async(save_podcast_async(_synthesized_podcast(params, chunks)))
+        
+        return _synthesis_response(chunks, elapsed)
+        
+    except Exception as e:
+        logger.error(f"Error synthesizing text: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+@api_async_bp.route('/translate_text', methods=['POST'])
+async def translate_text():
+    """
+    Async variant of /api/translate_text: translate the segments of a long
+    text concurrently and reassemble them in order
+    """
+    try:
+        text, target_language, max_tokens = _parse_translation_params()
+        
+        # Input validation
+        if not text:
+            return jsonify({"error": "No text provided"}), 400
+        if max_tokens is None:
+            return jsonify({"error": MAX_TOKENS_ERROR}), 400
+        
+        start_time = time.monotonic()
+        translator = AsyncTranslator(get_async_openai_client(), get_translation_cache())
+        segments = AsyncAudioProcessor(None, current_app.config['TONE_INSTRUCTIONS']).segment_text(
+            text, max_tokens)
+        results = await run_async(translator.translate_segments(
+            segments, target_language, max_concurrency=current_app.config['ASYNC_MAX_CONCURRENCY']))
+        
+        return _translation_response(text, target_language, segments, results, start_time)
+        
+    except Exception as e:
+        logger.error(f"Error translating text: {str(e)}")
+        return jsonify({"error": str(e)}), 500
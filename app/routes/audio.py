@@ -1,8 +1,15 @@
 from flask import Blueprint, send_file, send_from_directory, abort, jsonify, current_app
+import io
 import os
+import hashlib
 import logging
-from app.services.database import get_podcast_by_chunk_id, get_podcast_collection
+from app.services.database import get_podcast_by_chunk_id, get_podcast_collection, get_podcast_audio_record
+from app.services.audio_index import get_audio_index, UUID_PATTERN
+from app.services.gridfs_store import open_audio_file
+from app.utils.http import send_seekable, set_cache_headers
 from bson.binary import Binary
+from bson.objectid import ObjectId
+from bson.errors import InvalidId
 
 # Get logger
 logger = logging.getLogger(__name__)
@@ -10,6 +17,17 @@ logger = logging.getLogger(__name__)
 # Create audio blueprint
 audio_bp = Blueprint('audio', __name__)
 
+def _audio_max_age(name):
+    """Long cache lifetime for audio addressed by a UUID, which is never rewritten"""
+    if UUID_PATTERN.search(name):
+        return current_app.config['AUDIO_CACHE_MAX_AGE']
+    return None
+
+def _send_audio_file(path, name, **kwargs):
+    """send_file with its ETag/Range handling plus long-lived caching for UUID names"""
+    response = send_file(path, mimetype='audio/mpeg', **kwargs)
+    return set_cache_headers(response, max_age=_audio_max_age(name))
+
 @audio_bp.route('/<filename>')
 def serve_audio(filename):
     """Serve audio file"""
@@ -24,14 +42,14 @@ def serve_audio(filename):
         logger.info(f"Checking for audio file at: {audio_path}")
         if os.path.exists(audio_path):
             logger.info(f"Serving audio file from audio directory: {audio_path}")
-            return send_file(audio_path, mimetype='audio/mpeg')
+            return _send_audio_file(audio_path, filename)
         
         # If not found in audio directory, check in static upload folder
         static_path = os.path.join(static_audio_dir, filename)
         logger.info(f"Checking for audio file at: {static_path}")
         if os.path.exists(static_path):
             logger.info(f"Serving audio file from static directory: {static_path}")
-            return send_file(static_path, mimetype='audio/mpeg')
+            return _send_audio_file(static_path, filename)
             
         logger.error(f"Audio file not found: {filename}")
         return jsonify({"error": "Audio file not found"}), 404
@@ -45,48 +63,42 @@ def get_podcast_audio(chunk_id):
     try:
         logger.info(f"get_podcast_audio called with chunk_id: {chunk_id}")
         
-        # Get the absolute path to the audio directory
-        base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-        audio_dir = os.path.join(base_dir, 'audio')
-        logger.info(f"Base directory: {base_dir}")
-        logger.info(f"Audio directory: {audio_dir}")
+        # Single indexed lookup instead of scanning the audio directory
+        audio_index = get_audio_index()
+        audio_path = audio_index.lookup(chunk_id) if audio_index is not None else None
+        if audio_path and os.path.exists(audio_path):
+            return _send_audio_file(audio_path, chunk_id)
         
-        # First, check if there's an audio file directly matching the chunk_id pattern
-        audio_patterns = [
-            f"chunk_{chunk_id}.mp3",  # Most common pattern for the app
-            f"{chunk_id}.mp3",
-            f"translation_{chunk_id}.mp3"
-        ]
+        if audio_path:
+            logger.warning(f"Indexed audio file missing for chunk_id {chunk_id}: {audio_path}")
+            audio_index.remove(chunk_id)
         
-        # Check each pattern
-        for pattern in audio_patterns:
-            full_path = os.path.join(audio_dir, pattern)
-            logger.info(f"Checking path: {full_path}")
-            if os.path.exists(full_path):
-                logger.info(f"Found direct audio file match: {full_path}")
-                return send_file(full_path, mimetype='audio/mpeg')
+        # Files named after the chunk ID, in case the index is unavailable or
+        # the file was written by a process that did not index it
+        base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        for filename in (f"chunk_{chunk_id}.mp3", f"{chunk_id}.mp3", f"translation_{chunk_id}.mp3"):
+            audio_path = os.path.join(base_dir, 'audio', filename)
+            if os.path.exists(audio_path):
+                if audio_index is not None:
+                    audio_index.add(chunk_id, filename, replace=False)
+                return _send_audio_file(audio_path, chunk_id)
         
-        # List all audio files for debugging
-        try:
-            audio_files = os.listdir(audio_dir)
-            mp3_files = [f for f in audio_files if f.endswith('.mp3')]
-            logger.info(f"Available MP3 files in audio directory: {mp3_files}")
-            
-            # Search for partial matches in filenames
-            partial_matches = [f for f in mp3_files if chunk_id in f]
-            if partial_matches:
-                logger.info(f"Found partial matches for chunk_id {chunk_id}: {partial_matches}")
-                # Use the first match
-                audio_path = os.path.join(audio_dir, partial_matches[0])
-                if os.path.exists(audio_path):
-                    logger.info(f"Using partial match: {audio_path}")
-                    return send_file(audio_path, mimetype='audio/mpeg')
-                else:
-                    logger.warning(f"Partial match path doesn't exist: {audio_path}")
-        except Exception as e:
-            logger.error(f"Error listing audio directory: {str(e)}")
+        # Imported records keep the MP3 in GridFS, or embedded if not yet migrated
+        audio_record = get_podcast_audio_record(chunk_id)
+        if audio_record and audio_record.get('audio_file_id'):
+            grid_out = open_audio_file(audio_record['audio_file_id'])
+            if grid_out is not None:
+                logger.info(f"Streaming GridFS audio for chunk_id: {chunk_id}")
+                return send_seekable(grid_out, grid_out.length, 'audio/mpeg',
+                                     etag=str(grid_out._id), last_modified=grid_out.upload_date,
+                                     max_age=_audio_max_age(chunk_id))
+        if audio_record and audio_record.get('audio_data'):
+            logger.info(f"Serving embedded audio data for chunk_id: {chunk_id}")
+            audio_bytes = bytes(audio_record['audio_data'])
+            return send_seekable(io.BytesIO(audio_bytes), len(audio_bytes), 'audio/mpeg',
+                                 etag=hashlib.md5(audio_bytes).hexdigest(),
+                                 max_age=_audio_max_age(chunk_id))
         
-        # No matches found anywhere
         logger.error(f"No audio file found for chunk_id: {chunk_id}")
         return jsonify({"error": "Audio file not found"}), 404
             
@@ -94,11 +106,28 @@ def get_podcast_audio(chunk_id):
         logger.error(f"Error retrieving podcast audio for chunk {chunk_id}: {str(e)}")
         return jsonify({"error": str(e)}), 500
 
+@audio_bp.route('/gridfs/<file_id>', methods=['GET'])
+def serve_gridfs_audio(file_id):
+    """Stream an audio file from GridFS with HTTP Range support"""
+    try:
+        grid_out = open_audio_file(ObjectId(file_id))
+    except InvalidId:
+        return jsonify({"error": "Invalid file ID"}), 400
+    
+    if grid_out is None:
+        return jsonify({"error": "Audio file not found"}), 404
+    
+    # GridFS files are immutable, so the file ID is a strong validator
+    return send_seekable(grid_out, grid_out.length, 'audio/mpeg',
+                         etag=str(grid_out._id), last_modified=grid_out.upload_date,
+                         max_age=current_app.config['AUDIO_CACHE_MAX_AGE'])
+
 @audio_bp.route('/download/<filename>')
 def download_file(filename):
     """Download audio file"""
     try:
-        return send_from_directory('audio', filename, as_attachment=True)
+        response = send_from_directory('audio', filename, as_attachment=True)
+        return set_cache_headers(response, max_age=_audio_max_age(filename))
     except Exception as e:
         logger.error(f"Error downloading file {filename}: {str(e)}")
         abort(404) 
\ No newline at end of file
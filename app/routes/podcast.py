@@ -1,8 +1,10 @@
 from flask import Blueprint, request, jsonify, session, current_app, render_template
-from app.services.database import get_all_podcasts, get_podcast
+from app.services.database import get_all_podcasts, get_podcast, get_podcasts_page, count_podcasts, encode_cursor
+from app.services.database import get_podcast_stats
+from app.services.database import DETAIL_PROJECTION
+from app.services.audio_index import get_audio_index
 import logging
 import json
-import os
 from datetime import datetime
 from bson.objectid import ObjectId
 
@@ -12,57 +14,40 @@ logger = logging.getLogger(__name__)
 # Create podcast blueprint
 podcast_bp = Blueprint('podcast', __name__)
 
-def check_audio_exists(chunk_id=None, translation_id=None):
-    """Check if audio file exists for the given IDs"""
-    # Get a list of all mp3 files in the audio directory
-    audio_files = os.listdir('audio')
-    mp3_files = [f for f in audio_files if f.endswith('.mp3')]
-    
-    if chunk_id:
-        # First check for exact pattern matches
-        chunk_patterns = [f"chunk_{chunk_id}.mp3", f"{chunk_id}.mp3"]
-        for pattern in chunk_patterns:
-            if pattern in mp3_files:
-                logger.info(f"Found exact audio file match: {pattern}")
-                return True
-        
-        # Then check for any file containing the chunk_id
-        for file in mp3_files:
-            if chunk_id in file:
-                logger.info(f"Found audio file containing chunk_id: {file}")
-                return True
-    
-    if translation_id:
-        # First check for exact pattern matches
-        translation_patterns = [f"{translation_id}.mp3", f"translation_{translation_id}.mp3"]
-        for pattern in translation_patterns:
-            if pattern in mp3_files:
-                logger.info(f"Found exact audio file match: {pattern}")
-                return True
-                
-        # Then check for any file containing the translation_id
-        for file in mp3_files:
-            if translation_id in file:
-                logger.info(f"Found audio file containing translation_id: {file}")
-                return True
-    
-    # No matching files found
-    return False
+def find_existing_audio(ids):
+    """Return the subset of chunk/translation IDs that have an audio file, in one batched lookup"""
+    audio_index = get_audio_index()
+    if audio_index is None:
+        return set()
+    return audio_index.existing(ids)
 
 @podcast_bp.route('/list', methods=['GET'])
 def podcast_list():
     """List all podcasts"""
     try:
         # Get pagination parameters
-        page = request.args.get('page', 1, type=int)
+        page = max(request.args.get('page', 1, type=int), 1)
         per_page = request.args.get('per_page', 10, type=int)
+        after = request.args.get('after')
+        before = request.args.get('before')
+        
+        # Previous/Next follow keyset cursors; only direct page jumps use skip
+        if after or before:
+            podcasts = get_podcasts_page(limit=per_page, after=after, before=before)
+        else:
+            skip = (page - 1) * per_page
+            podcasts = get_all_podcasts(limit=per_page, skip=skip)
         
-        # Get podcasts from database with pagination
-        skip = (page - 1) * per_page
-        podcasts = get_all_podcasts(limit=per_page, skip=skip)
+        # Cursors for the neighbouring pages, taken before fields are formatted
+        prev_cursor = None
+        next_cursor = None
+        if podcasts and isinstance(podcasts[0].get('created_at'), datetime):
+            prev_cursor = encode_cursor(podcasts[0])
+        if podcasts and isinstance(podcasts[-1].get('created_at'), datetime):
+            next_cursor = encode_cursor(podcasts[-1])
         
         # Get total count
-        total_records = len(get_all_podcasts(limit=1000))  # Limited to 1000 to prevent performance issues
+        total_records = count_podcasts()
         total_pages = (total_records + per_page - 1) // per_page  # Ceiling division
         
         # Format records for template
@@ -93,11 +78,6 @@ def podcast_list():
                 original_text = podcast.get('original_text', '')
                 translated_text = podcast.get('translated_text', '')
                 logger.info(f"Found document with direct chunk_id: {chunk_id}")
-                
-                # Verify if audio file actually exists for this chunk_id
-                if chunk_id and not check_audio_exists(chunk_id=chunk_id):
-                    logger.info(f"No audio file found for chunk_id: {chunk_id}")
-                    chunk_id = None  # Set to None if no audio file exists
             
             # Handle the old structure with nested chunks (just in case)
             elif 'chunks' in podcast and len(podcast['chunks']) > 0:
@@ -105,11 +85,6 @@ def podcast_list():
                 chunk_id = chunk.get('chunk_id')
                 original_text = chunk.get('text', '')
                 logger.info(f"Found document with nested chunk_id: {chunk_id}")
-                
-                # Verify if audio file actually exists for this chunk_id
-                if chunk_id and not check_audio_exists(chunk_id=chunk_id):
-                    logger.info(f"No audio file found for chunk_id: {chunk_id}")
-                    chunk_id = None  # Set to None if no audio file exists
             
             # Handle translation_id for completeness (if we ever have it)
             elif 'translation_id' in podcast:
@@ -117,11 +92,6 @@ def podcast_list():
                 original_text = podcast.get('original_text', '')
                 translated_text = podcast.get('translated_text', '')
                 logger.info(f"Found document with translation_id: {translation_id}")
-                
-                # Verify if audio file actually exists for this translation_id
-                if translation_id and not check_audio_exists(translation_id=translation_id):
-                    logger.info(f"No audio file found for translation_id: {translation_id}")
-                    translation_id = None  # Set to None if no audio file exists
             
             # Create record in the format expected by the template
             record = {
@@ -133,6 +103,17 @@ def podcast_list():
                 'created_at': podcast.get('created_at', '')
             }
             records.append(record)
+        
+        # Verify audio files exist for the whole page at once
+        existing_ids = find_existing_audio(
+            [record['chunk_id'] for record in records] +
+            [record['translation_id'] for record in records]
+        )
+        for record in records:
+            for id_field in ('chunk_id', 'translation_id'):
+                if record[id_field] and record[id_field] not in existing_ids:
+                    logger.info(f"No audio file found for {id_field}: {record[id_field]}")
+                    record[id_field] = None  # Set to None if no audio file exists
             
             # Log the record for debugging
             logger.info(f"Record: chunk_id={record['chunk_id']}, translation_id={record['translation_id']}")
@@ -144,7 +125,9 @@ def podcast_list():
                               page=page,
                               per_page=per_page,
                               total_records=total_records,
-                              total_pages=total_pages)
+                              total_pages=total_pages,
+                              prev_cursor=prev_cursor,
+                              next_cursor=next_cursor)
     except Exception as e:
         logger.error(f"Error retrieving podcast list: {str(e)}")
         return render_template('podcast_list.html', 
@@ -155,12 +138,28 @@ def podcast_list():
                               total_pages=0,
                               error=str(e))
 
+@podcast_bp.route('/stats', methods=['GET'])
+def podcast_stats():
+    """Get collection statistics (totals, language split, voice/tone distribution) as JSON"""
+    try:
+        max_age = current_app.config['STATS_CACHE_SECONDS']
+        stats = get_podcast_stats(max_age)
+        if stats is None:
+            return jsonify({"error": "Statistics unavailable"}), 503
+        
+        response = jsonify(stats)
+        response.cache_control.max_age = max_age
+        return response
+    except Exception as e:
+        logger.error(f"Error retrieving podcast stats: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
 @podcast_bp.route('/get_history', methods=['GET'])
 def get_podcast_history():
     """Get podcast history as JSON"""
     try:
-        # Get podcasts from database
-        podcasts = get_all_podcasts(limit=50)
+        # Get podcasts from database (full chunk lists, but never the audio blobs)
+        podcasts = get_all_podcasts(limit=50, projection=DETAIL_PROJECTION)
         
         # Convert datetime objects to strings for JSON serialization
         for podcast in podcasts:
@@ -0,0 +1,81 @@
+import asyncio
+import logging
+import threading
+from pymongo import AsyncMongoClient
+from app.services.database import build_mongo_uri, podcast_document
+from app.services.openai_client import build_async_openai_client
+
+# Event loop running in a background thread of this process. Async routes
+# hand their coroutines to it, so the clients below and their connection
+# pools live on a single loop shared by every request.
+event_loop = None
+
+# Application-wide async clients (bound to event_loop)
+async_openai_client = None
+async_mongo_client = None
+async_podcast_collection = None
+
+# Seconds to wait for the async MongoDB client to connect at startup
+CONNECT_TIMEOUT = 10
+
+logger = logging.getLogger(__name__)
+
+async def _connect_mongo(config):
+    """Create the async MongoDB client on the event loop and verify the connection"""
+    client = AsyncMongoClient(build_mongo_uri(config))
+    await client.admin.command('ping')
+    return client
+
+def init_async_runtime(app):
+    """Start the event loop thread and create the async OpenAI and MongoDB clients"""
+    global event_loop, async_openai_client, async_mongo_client, async_podcast_collection
+    
+    if not app.config['ASYNC_API_ENABLED']:
+        return
+    
+    event_loop = asyncio.new_event_loop()
+    threading.Thread(target=event_loop.run_forever, name='async-api-loop', daemon=True).start()
+    
+    try:
+        async_openai_client = build_async_openai_client(app.config)
+    except Exception as e:
+        logger.error(f"Error initializing async OpenAI client: {str(e)}")
+        async_openai_client = None
+    
+    try:
+        async_mongo_client = asyncio.run_coroutine_threadsafe(
+            _connect_mongo(app.config), event_loop).result(CONNECT_TIMEOUT)
+        async_podcast_collection = async_mongo_client[app.config['MONGODB_DB']]["podcasts"]
+        logger.info("Async API ready, connected to MongoDB")
+    except Exception as e:
+        logger.error(f"Error connecting async MongoDB client: {str(e)}")
+        async_mongo_client = None
+        async_podcast_collection = None
+
+async def run_async(coro):
+    """Run coro on the shared event loop and await its result from the calling loop"""
+    if event_loop is None:
+        coro.close()
+        raise RuntimeError("The async API is not enabled. Set ASYNC_API_ENABLED=true.")
+    return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, event_loop))
+
+def get_async_openai_client():
+    """Get the shared AsyncOpenAI client instance"""
+    if async_openai_client is None:
+        raise RuntimeError("OpenAI client is not configured. Please set your OpenAI API key.")
+    return async_openai_client
+
+def get_async_podcast_collection():
+    """Get the async podcast collection (None when MongoDB is unavailable)"""
+    return async_podcast_collection
+
+async def save_podcast_async(podcast_data):
+    """Save podcast data to database; must run on the shared event loop"""
+    if async_podcast_collection is not None:
+        try:
+            document = await asyncio.to_thread(podcast_document, podcast_data)
+            result = await async_podcast_collection.insert_one(document)
+            return result.inserted_id
+        except Exception as e:
+            logger.error(f"Error saving podcast: {str(e)}")
+    return None
@@ -0,0 +1,165 @@
+import os
+import re
+import sqlite3
+import logging
+import threading
+from pymongo import MongoClient
+from app.services.database import get_podcast_collection, build_mongo_uri
+
+# Application-wide chunk ID -> audio file index
+audio_index = None
+
+# Filenames that map exactly to a chunk or translation ID
+EXACT_FILENAME_PATTERN = re.compile(r'^(?:chunk_|translation_)?([0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})\.mp3$')
+
+# Any UUID inside a filename, for names that only contain the ID
+UUID_PATTERN = re.compile(r'[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}')
+
+logger = logging.getLogger(__name__)
+
+# Maximum IDs per SQLite IN (...) query
+MAX_QUERY_IDS = 500
+
+class AudioIndex:
+    """
+    Persistent SQLite index from chunk/translation IDs to audio filenames.
+    The set of indexed IDs is also kept in memory so presence checks for a
+    whole page of records cost one set intersection.
+    """
+
+    def __init__(self, db_path, audio_dir):
+        self.audio_dir = audio_dir
+        self._ids = set()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS audio_files (chunk_id TEXT PRIMARY KEY, filename TEXT NOT NULL)"
+        )
+        self._conn.commit()
+
+    def add(self, chunk_id, filename, replace=True):
+        """Map chunk_id to a file in the audio directory"""
+        verb = "INSERT OR REPLACE" if replace else "INSERT OR IGNORE"
+        with self._lock:
+            self._conn.execute(f"{verb} INTO audio_files (chunk_id, filename) VALUES (?, ?)", (chunk_id, filename))
+            self._conn.commit()
+            self._ids.add(chunk_id)
+
+    def remove(self, chunk_id):
+        with self._lock:
+            self._conn.execute("DELETE FROM audio_files WHERE chunk_id = ?", (chunk_id,))
+            self._conn.commit()
+            self._ids.discard(chunk_id)
+
+    def existing(self, chunk_ids):
+        """
+        Return the subset of chunk_ids that have audio.
+        IDs missing from memory are checked against the table in one batched
+        query, which picks up files indexed by other worker processes.
+        """
+        wanted = {chunk_id for chunk_id in chunk_ids if chunk_id}
+        with self._lock:
+            found = wanted & self._ids
+            missing = list(wanted - found)
+            for start in range(0, len(missing), MAX_QUERY_IDS):
+                batch = missing[start:start + MAX_QUERY_IDS]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT chunk_id FROM audio_files WHERE chunk_id IN ({placeholders})", batch
+                ).fetchall()
+                newly_found = {row[0] for row in rows}
+                self._ids |= newly_found
+                found |= newly_found
+        return found
+
+    def lookup(self, chunk_id):
+        """Return the absolute path of the audio file for chunk_id, or None"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT filename FROM audio_files WHERE chunk_id = ?", (chunk_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        return os.path.abspath(os.path.join(self.audio_dir, row[0]))
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def rebuild(self, podcast_collection=None):
+        """
+        Bring the index up to date with the audio directory and the podcast
+        records. Exact filename patterns and database records take precedence
+        over IDs that merely appear inside a filename. Rows found in neither
+        (such as near-duplicate reuse, which is only recorded here) are kept;
+        stale rows are dropped when lookups find their file missing.
+        """
+        exact = []
+        partial = []
+        for entry in os.scandir(self.audio_dir):
+            if not entry.is_file() or not entry.name.endswith('.mp3'):
+                continue
+            match = EXACT_FILENAME_PATTERN.match(entry.name)
+            if match:
+                exact.append((match.group(1), entry.name))
+            else:
+                partial.extend((chunk_id, entry.name) for chunk_id in UUID_PATTERN.findall(entry.name))
+
+        if podcast_collection is not None:
+            try:
+                cursor = podcast_collection.find(
+                    {'chunks.filename': {'$exists': True}},
+                    {'chunks.chunk_id': 1, 'chunks.filename': 1}
+                )
+                for podcast in cursor:
+                    for chunk in podcast.get('chunks', []):
+                        if chunk.get('chunk_id') and chunk.get('filename'):
+                            exact.append((chunk['chunk_id'], chunk['filename']))
+            except Exception as e:
+                logger.error(f"Error reading podcast chunks for audio index: {str(e)}")
+
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO audio_files (chunk_id, filename) VALUES (?, ?)", exact)
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO audio_files (chunk_id, filename) VALUES (?, ?)", partial)
+            self._conn.commit()
+            self._ids = {row[0] for row in self._conn.execute("SELECT chunk_id FROM audio_files")}
+        logger.info(f"Audio index rebuilt with {len(self._ids)} entries")
+
+def rebuild_audio_index(app):
+    """
+    Rebuild the audio index with a short-lived MongoDB client, for a process
+    that does not run init_app_services (such as the gunicorn master, once
+    before its workers start)
+    """
+    mongo_client = None
+    index = None
+    try:
+        mongo_client = MongoClient(build_mongo_uri(app.config), serverSelectionTimeoutMS=5000)
+        index = AudioIndex(app.config['AUDIO_INDEX_PATH'], 'audio')
+        index.rebuild(mongo_client[app.config['MONGODB_DB']]["podcasts"])
+    except Exception as e:
+        logger.error(f"Error rebuilding audio index: {str(e)}")
+    finally:
+        if index is not None:
+            index.close()
+        if mongo_client is not None:
+            mongo_client.close()
+
+def init_audio_index(app):
+    """Open the audio index, rebuilding it from disk and the database if configured"""
+    global audio_index
+
+    try:
+        audio_index = AudioIndex(app.config['AUDIO_INDEX_PATH'], 'audio')
+        if app.config['AUDIO_INDEX_REBUILD_ON_START']:
+            audio_index.rebuild(get_podcast_collection())
+    except Exception as e:
+        logger.error(f"Error initializing audio index: {str(e)}")
+        audio_index = None
+
+def get_audio_index():
+    """Get the audio index instance"""
+    return audio_index
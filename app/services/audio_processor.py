@@ -1,33 +1,139 @@
 import pydub
+import asyncio
 import uuid
 import os
-import tiktoken
+import bisect
 import re
 import logging
-from openai import OpenAI
+from contextlib import ExitStack
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from app.services.tokenizer import get_encoding, count_tokens
+from app.utils.mp3 import merge_mp3_frames
 
 # Get logger
 logger = logging.getLogger(__name__)
 
+# Patterns used to split text at sentence and word boundaries
+SENTENCE_SPLIT_PATTERN = re.compile(r'(?<=[.!?])\s+')
+WORD_SPLIT_PATTERN = re.compile(' ')
+
+# Text-to-speech model used for all synthesis
+TTS_MODEL = "tts-1-hd"
+
 class AudioProcessor:
-    def __init__(self, api_key, tone_instructions):
-        """Initialize the audio processor with OpenAI API key and tone instructions"""
-        self.client = OpenAI(api_key=api_key)
+    def __init__(self, client, tone_instructions, cache=None, rate_limiter=None, audio_index=None):
+        """
+        Initialize the audio processor with a shared OpenAI client and tone instructions.
+        The client may be None when the processor is only used for chunking.
+        When a TTSCache is given, identical synthesis requests reuse cached audio.
+        When a RateLimiter is given, every speech API call waits for it first.
+        When an AudioIndex is given, files generated for a chunk ID are registered in it.
+        """
+        self.client = client
         self.tone_instructions = tone_instructions
+        self.cache = cache
+        self.rate_limiter = rate_limiter
+        self.audio_index = audio_index
         
     def num_tokens_from_string(self, string, model="gpt-4o"):
         """Returns the number of tokens in a text string."""
-        encoding = tiktoken.encoding_for_model(model)
-        return len(encoding.encode(string))
+        return count_tokens(string, model)
 
+    def _token_offsets(self, text, model="gpt-4o"):
+        """Encode text once and return the character offset of every token."""
+        encoding = get_encoding(model)
+        tokens = encoding.encode(text)
+        if not tokens:
+            return []
+        _, offsets = encoding.decode_with_offsets(tokens)
+        return offsets
+
+    @staticmethod
+    def _split_spans(text, pattern, start, end):
+        """
+        Split text[start:end] on pattern, mirroring re.split.
+        Yields (owner_start, piece_start, piece_end) where the owner range
+        [owner_start, piece_end) also covers the separator before the piece,
+        so consecutive owner ranges tile the whole span.
+        """
+        owner_start = start
+        piece_start = start
+        for match in pattern.finditer(text, start, end):
+            yield owner_start, piece_start, match.start()
+            owner_start = match.start()
+            piece_start = match.end()
+        yield owner_start, piece_start, end
+
+    def _split_text(self, text, offsets, max_tokens, render):
+        """
+        Split text at sentence boundaries, and sentences longer than
+        max_tokens at word boundaries, into spans of at most max_tokens.
+        render(start, end) gives the chunk text for a span. Pieces are sized
+        from a single encoding of the whole text, then each chunk is encoded
+        once as render returns it and gives back trailing pieces if it came
+        out longer (tokens can merge differently across the new boundaries).
+        A sentence that still does not fit on its own is split by words, and a
+        single word over max_tokens is kept as a chunk of its own.
+        offsets are the token offsets of text (see _token_offsets).
+        Returns (start, end, tokens) for every span.
+        """
+        encoding = get_encoding()
+        
+        def count_tokens(start, end):
+            """Number of tokens starting inside text[start:end]"""
+            return bisect.bisect_left(offsets, end) - bisect.bisect_left(offsets, start)
+        
+        # (owner_start, start, end) of every sentence or word, the first word
+        # of a split sentence owning the sentence separator
+        pieces = []
+        for owner_start, sentence_start, sentence_end in self._split_spans(
+                text, SENTENCE_SPLIT_PATTERN, 0, len(text)):
+            if count_tokens(owner_start, sentence_end) > max_tokens:
+                words = list(self._split_spans(text, WORD_SPLIT_PATTERN, sentence_start, sentence_end))
+                words[0] = (owner_start,) + words[0][1:]
+                pieces.extend(words)
+            else:
+                pieces.append((owner_start, sentence_start, sentence_end))
+        
+        spans = []
+        first = 0
+        while first < len(pieces):
+            last = first
+            estimate = count_tokens(pieces[first][0], pieces[first][2])
+            while last + 1 < len(pieces):
+                piece_tokens = count_tokens(pieces[last + 1][0], pieces[last + 1][2])
+                if estimate + piece_tokens > max_tokens:
+                    break
+                last += 1
+                estimate += piece_tokens
+            
+            start = pieces[first][1]
+            tokens = len(encoding.encode(render(start, pieces[last][2])))
+            while tokens > max_tokens and last > first:
+                last -= 1
+                tokens = len(encoding.encode(render(start, pieces[last][2])))
+            if tokens > max_tokens:
+                # A sentence that only fits with its separator: split it by words after all
+                owner_start, _, end = pieces[first]
+                words = list(self._split_spans(text, WORD_SPLIT_PATTERN, start, end))
+                if len(words) > 1:
+                    words[0] = (owner_start,) + words[0][1:]
+                    pieces[first:first + 1] = words
+                    continue
+            spans.append((start, pieces[last][2], tokens))
+            first = last + 1
+        return spans
+    
     def chunk_text(self, text, max_tokens=2000):
         """
         Split text into chunks not exceeding max_tokens,
         breaking at sentence boundaries when possible.
-        Uses tiktoken to accurately count tokens.
+        Sentences in a chunk are joined by single spaces.
+        Uses tiktoken to accurately count tokens (see _split_text).
         """
-        total_tokens = self.num_tokens_from_string(text)
+        offsets = self._token_offsets(text)
+        total_tokens = len(offsets)
         logger.info(f"Total tokens in input text: {total_tokens}")
         
         # If text is short enough, return it as is
@@ -35,99 +141,111 @@ class AudioProcessor:
             logger.info(f"Text is short enough ({total_tokens} tokens), returning as single chunk")
             return [text]
         
-        # Pattern to split text at sentence boundaries
-        sentence_split_pattern = r'(?<=[.!?])\s+'
-        
-        # Split text by sentences
-        sentences = re.split(sentence_split_pattern, text)
-        logger.info(f"Split into {len(sentences)} sentences")
+        def render(start, end):
+            return SENTENCE_SPLIT_PATTERN.sub(' ', text[start:end]).strip()
         
         chunks = []
-        current_chunk = ""
-        current_tokens = 0
-        
-        for sentence in sentences:
-            sentence_tokens = self.num_tokens_from_string(sentence)
-            
-            # If this single sentence exceeds the token limit, we need to split it further
-            if sentence_tokens > max_tokens:
-                # If we have content in the current chunk, add it first
-                if current_chunk:
-                    chunks.append(current_chunk.strip())
-                    current_chunk = ""
-                    current_tokens = 0
-                
-                # Split the long sentence into smaller parts (by words)
-                words = sentence.split(' ')
-                sub_chunk = ""
-                sub_tokens = 0
-                
-                for word in words:
-                    word_tokens = self.num_tokens_from_string(word + " ")
-                    if sub_tokens + word_tokens <= max_tokens:
-                        sub_chunk += word + " "
-                        sub_tokens += word_tokens
-                    else:
-                        if sub_chunk:
-                            chunks.append(sub_chunk.strip())
-                        sub_chunk = word + " "
-                        sub_tokens = word_tokens
-                
-                if sub_chunk:
-                    current_chunk = sub_chunk
-                    current_tokens = sub_tokens
-            
-            # If adding this sentence would exceed the limit, start a new chunk
-            elif current_tokens + sentence_tokens > max_tokens:
-                if current_chunk:
-                    chunks.append(current_chunk.strip())
-                current_chunk = sentence
-                current_tokens = sentence_tokens
-            else:
-                # Add the sentence to the current chunk
-                current_chunk += " " + sentence if current_chunk else sentence
-                current_tokens += sentence_tokens
-        
-        # Add the last chunk if it's not empty
-        if current_chunk:
-            chunks.append(current_chunk.strip())
+        chunk_tokens = []
+        for start, end, tokens in self._split_text(text, offsets, max_tokens, render):
+            chunk = render(start, end)
+            if chunk:
+                chunks.append(chunk)
+                chunk_tokens.append(tokens)
         
         # Log token counts for each chunk
-        for i, chunk in enumerate(chunks):
-            chunk_tokens = self.num_tokens_from_string(chunk)
-            logger.info(f"Chunk {i+1}/{len(chunks)}: {chunk_tokens} tokens")
+        for i, tokens in enumerate(chunk_tokens):
+            logger.info(f"Chunk {i+1}/{len(chunks)}: {tokens} tokens")
         
         return chunks
     
-    def generate_audio(self, text, voice="nova", tone="neutral", is_chinese=False):
-        """Generate audio from text using OpenAI's Text-to-Speech API"""
+    def segment_text(self, text, max_tokens=2000):
+        """
+        Split text into segments not exceeding max_tokens at the same
+        sentence and word boundaries as chunk_text, but return slices of the
+        original text, so line breaks and spacing inside a segment are kept.
+        The whitespace between segments is not part of any segment.
+        """
+        offsets = self._token_offsets(text)
+        if len(offsets) <= max_tokens:
+            return [text]
+        
+        def render(start, end):
+            return text[start:end]
+        
+        return [text[start:end] for start, end, _ in self._split_text(text, offsets, max_tokens, render)
+                if text[start:end].strip()]
+    
+    def _register_audio(self, chunk_id, filename):
+        """Record which file holds the audio for chunk_id"""
+        if chunk_id is None or self.audio_index is None:
+            return
+        try:
+            self.audio_index.add(chunk_id, filename)
+        except Exception as e:
+            logger.error(f"Error indexing audio for chunk {chunk_id}: {str(e)}")
+    
+    @staticmethod
+    def _new_audio_file():
+        """Generate a unique filename and its path under the audio directory"""
+        timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
+        filename = f"{timestamp}_{uuid.uuid4()}.mp3"
+        return filename, os.path.join('audio', filename)
+    
+    def _save_audio(self, content, output_path, cache_key=None, chunk_id=None):
+        """Write synthesized audio to disk, add it to the TTS cache and index it"""
+        with open(output_path, "wb") as f:
+            f.write(content)
+        
+        if cache_key is not None:
+            self.cache.put(cache_key, output_path)
+        self._register_audio(chunk_id, os.path.basename(output_path))
+    
+    def generate_audio(self, text, voice="nova", tone="neutral", is_chinese=False, chunk_id=None):
+        """
+        Generate audio from text using OpenAI's Text-to-Speech API.
+        If chunk_id is given, the file is registered in the audio index under it.
+        """
         # Prepare system instructions based on tone and language
         system_instructions = self.tone_instructions.get(tone, self.tone_instructions["neutral"])
         if is_chinese:
             system_instructions += " Please speak in fluent Chinese with natural pronunciation."
         
         try:
+            filename, output_path = self._new_audio_file()
+            
+            # Reuse identical audio generated earlier
+            cache_key = None
+            if self.cache is not None:
+                cache_key = self.cache.make_key(text, voice, tone, is_chinese, TTS_MODEL)
+                if self.cache.get(cache_key, output_path):
+                    logger.info(f"TTS cache hit for {cache_key[:12]}, skipping synthesis")
+                    self._register_audio(chunk_id, filename)
+                    return {
+                        "filename": filename,
+                        "path": output_path,
+                        "success": True,
+                        "cached": True
+                    }
+            
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+            
             # Generate audio response
             response = self.client.audio.speech.create(
-                model="tts-1-hd",
+                model=TTS_MODEL,
                 voice=voice,
                 input=text,
                 response_format="mp3"
             )
             
-            # Generate a unique filename
-            timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
-            filename = f"{timestamp}_{uuid.uuid4()}.mp3"
-            output_path = os.path.join('audio', filename)
-            
             # Save the audio file
-            with open(output_path, "wb") as f:
-                f.write(response.content)
+            self._save_audio(response.content, output_path, cache_key, chunk_id)
                 
             return {
                 "filename": filename,
                 "path": output_path,
-                "success": True
+                "success": True,
+                "cached": False
             }
             
         except Exception as e:
@@ -137,18 +255,138 @@ class AudioProcessor:
                 "error": str(e)
             }
     
+    def stream_audio(self, text, voice="nova", tone="neutral", is_chinese=False, chunk_size=8192, chunk_id=None):
+        """
+        Start speech synthesis and return a generator of MP3 bytes as they arrive.
+        The audio is teed to disk while streaming and added to the TTS cache once
+        complete. The API request is made before returning, so API errors raise here
+        rather than in the middle of a streamed response.
+        """
+        filename, output_path = self._new_audio_file()
+        
+        # Stream identical audio generated earlier straight from disk
+        cache_key = None
+        if self.cache is not None:
+            cache_key = self.cache.make_key(text, voice, tone, is_chinese, TTS_MODEL)
+            if self.cache.get(cache_key, output_path):
+                logger.info(f"TTS cache hit for {cache_key[:12]}, streaming cached audio")
+                self._register_audio(chunk_id, filename)
+                return {
+                    "filename": filename,
+                    "path": output_path,
+                    "cached": True,
+                    "stream": self._stream_file(output_path, chunk_size)
+                }
+        
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+        
+        stack = ExitStack()
+        try:
+            response = stack.enter_context(self.client.audio.speech.with_streaming_response.create(
+                model=TTS_MODEL,
+                voice=voice,
+                input=text,
+                response_format="mp3"
+            ))
+        except Exception:
+            stack.close()
+            raise
+        
+        return {
+            "filename": filename,
+            "path": output_path,
+            "cached": False,
+            "stream": self._tee_stream(response, stack, output_path, cache_key, chunk_size, chunk_id)
+        }
+    
+    @staticmethod
+    def _stream_file(path, chunk_size):
+        """Yield a file's contents in chunks"""
+        with open(path, "rb") as f:
+            while True:
+                data = f.read(chunk_size)
+                if not data:
+                    break
+                yield data
+    
+    def _tee_stream(self, response, stack, output_path, cache_key, chunk_size, chunk_id=None):
+        """
+        Yield the speech response body while writing it to output_path.
+        output_path only exists once the whole body was written; errors are
+        re-raised after the partial file is removed.
+        """
+        partial_path = f"{output_path}.part"
+        completed = False
+        try:
+            with stack, open(partial_path, "wb") as f:
+                chunks = response.iter_bytes(chunk_size)
+                try:
+                    for data in chunks:
+                        f.write(data)
+                        yield data
+                except GeneratorExit:
+                    # The client went away but the audio is already paid for,
+                    # so finish writing it to disk for the cache and retries
+                    logger.info(f"Client disconnected, finishing {output_path} without streaming")
+                    for data in chunks:
+                        f.write(data)
+                    completed = True
+                    raise
+                completed = True
+        except Exception as e:
+            # Re-raise so the response is aborted rather than ending as if complete
+            logger.error(f"Error streaming audio to {output_path}: {str(e)}")
+            raise
+        finally:
+            if completed:
+                os.replace(partial_path, output_path)
+                if cache_key is not None:
+                    self.cache.put(cache_key, output_path)
+                self._register_audio(chunk_id, os.path.basename(output_path))
+            elif os.path.exists(partial_path):
+                os.remove(partial_path)
+    
+    def generate_audio_batch(self, texts, voice="nova", tone="neutral", is_chinese=False, max_workers=4,
+                             chunk_ids=None):
+        """
+        Generate audio for several texts concurrently.
+        Returns one generate_audio result per text, in the same order.
+        """
+        if not texts:
+            return []
+        if chunk_ids is None:
+            chunk_ids = [None] * len(texts)
+        
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(texts))) as executor:
+            return list(executor.map(
+                lambda text, chunk_id: self.generate_audio(text, voice, tone, is_chinese, chunk_id),
+                texts,
+                chunk_ids
+            ))
+    
     def merge_audio_files(self, audio_files):
-        """Merge multiple audio files into a single MP3 file"""
+        """
+        Merge multiple audio files into a single MP3 file.
+        Chunks with matching MPEG parameters are joined frame by frame without
+        decoding; otherwise they are decoded and re-encoded with pydub.
+        """
         try:
-            combined = pydub.AudioSegment.empty()
-            for file_path in audio_files:
-                audio = pydub.AudioSegment.from_mp3(file_path)
-                combined += audio
-            
             # Generate a unique filename
-            output_filename = f"{uuid.uuid4()}.mp3"
+            merged_id = str(uuid.uuid4())
+            output_filename = f"{merged_id}.mp3"
             output_path = os.path.join('audio', output_filename)
-            combined.export(output_path, format="mp3")
+            
+            if merge_mp3_frames(audio_files, output_path):
+                logger.info(f"Merged {len(audio_files)} files frame by frame into {output_filename}")
+            else:
+                logger.info(f"MPEG parameters differ, re-encoding {len(audio_files)} files with pydub")
+                combined = pydub.AudioSegment.empty()
+                for file_path in audio_files:
+                    audio = pydub.AudioSegment.from_mp3(file_path)
+                    combined += audio
+                combined.export(output_path, format="mp3")
+            self._register_audio(merged_id, output_filename)
             
             return {
                 "filename": output_filename,
@@ -160,4 +398,79 @@ class AudioProcessor:
             return {
                 "success": False,
                 "error": str(e)
-            } 
\ No newline at end of file
+            }
+
+
+class AsyncAudioProcessor(AudioProcessor):
+    """
+    AudioProcessor for an AsyncOpenAI client: synthesis methods are
+    coroutines, chunking is inherited unchanged. Cache lookups, file writes
+    and index updates run in worker threads so they never block the event loop.
+    """
+    
+    async def generate_audio(self, text, voice="nova", tone="neutral", is_chinese=False, chunk_id=None):
+        """
+        Generate audio from text using OpenAI's Text-to-Speech API.
+        If chunk_id is given, the file is registered in the audio index under it.
+        """
+        try:
+            filename, output_path = self._new_audio_file()
+            
+            # Reuse identical audio generated earlier
+            cache_key = None
+            if self.cache is not None:
+                cache_key = self.cache.make_key(text, voice, tone, is_chinese, TTS_MODEL)
+                if await asyncio.to_thread(self.cache.get, cache_key, output_path):
+                    logger.info(f"TTS cache hit for {cache_key[:12]}, skipping synthesis")
+                    await asyncio.to_thread(self._register_audio, chunk_id, filename)
+                    return {
+                        "filename": filename,
+                        "path": output_path,
+                        "success": True,
+                        "cached": True
+                    }
+            
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire_async()
+            
+            response = await self.client.audio.speech.create(
+                model=TTS_MODEL,
+                voice=voice,
+                input=text,
+                response_format="mp3"
+            )
+            
+            await asyncio.to_thread(self._save_audio, response.content, output_path, cache_key, chunk_id)
+            
+            return {
+                "filename": filename,
+                "path": output_path,
+                "success": True,
+                "cached": False
+            }
+            
+        except Exception as e:
+            logger.error(f"Error generating audio: {str(e)}")
+            return {
+                "success": False,
+                "error": str(e)
+            }
+    
+    async def generate_audio_batch(self, texts, voice="nova", tone="neutral", is_chinese=False,
+                                   max_concurrency=100, chunk_ids=None):
+        """
+        Generate audio for several texts with at most max_concurrency speech
+        requests in flight. Returns one generate_audio result per text, in order.
+        """
+        if not texts:
+            return []
+        if chunk_ids is None:
+            chunk_ids = [None] * len(texts)
+        
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def generate(text, chunk_id):
+            async with semaphore:
+                return await self.generate_audio(text, voice, tone, is_chinese, chunk_id)
+        
+        return await asyncio.gather(*(generate(text, chunk_id) for text, chunk_id in zip(texts, chunk_ids)))
@@ -1,23 +1,99 @@
-from pymongo import MongoClient
+from pymongo import MongoClient, ASCENDING
+from bson.objectid import ObjectId
+from datetime import datetime
 import logging
+import time
+from app.services.indexes import LIST_SORT, RETIRED_PODCAST_INDEXES, ensure_indexes
+from app.services.near_duplicates import signature_fields
 
 # Initialize MongoDB client and collections
 mongo_client = None
 db = None
 podcast_collection = None
 
+# Named projections so listings never pull embedded audio blobs
+# Listing: only the fields the list page and history JSON display
+LISTING_PROJECTION = {
+    "chunk_id": 1,
+    "translation_id": 1,
+    "original_text": 1,
+    "translated_text": 1,
+    "source_url": 1,
+    "created_at": 1,
+    "title": 1,
+    "voice": 1,
+    "tone": 1,
+    "is_chinese": 1,
+    # First chunk only, without its near-duplicate signature
+    "chunks": {"$map": {
+        "input": {"$slice": [{"$ifNull": ["$chunks", []]}, 1]},
+        "as": "chunk",
+        "in": {"$arrayToObject": {"$filter": {
+            "input": {"$objectToArray": "$$chunk"},
+            "cond": {"$not": [{"$in": ["$$this.k", ["minhash", "lsh_buckets"]]}]}
+        }}}
+    }}
+}
+# Detail: the whole record except the audio and near-duplicate signatures
+DETAIL_PROJECTION = {
+    "audio_data": 0,
+    "audio_file_id": 0,
+    "minhash": 0,
+    "lsh_buckets": 0,
+    "chunks.minhash": 0,
+    "chunks.lsh_buckets": 0
+}
+# Audio only: the GridFS file reference, or the legacy embedded MP3
+AUDIO_PROJECTION = {"_id": 0, "audio_file_id": 1, "audio_data": 1}
+
+# Cached collection size and when it expires
+COUNT_CACHE_SECONDS = 30
+_count_cache = {"value": None, "expires": 0.0}
+
+# Cached collection statistics and when they expire
+_stats_cache = {"value": None, "expires": 0.0}
+
+def _count_where(field, value):
+    """$sum expression counting documents whose field equals value"""
+    return {"$sum": {"$cond": [{"$eq": [f"${field}", value]}, 1, 0]}}
+
+# Totals, language split and voice/tone distributions in a single collection pass
+STATS_PIPELINE = [
+    {"$project": {"is_chinese": 1, "is_standalone_translation": 1, "voice": 1, "tone": 1}},
+    {"$facet": {
+        "totals": [{"$group": {
+            "_id": None,
+            "total_records": {"$sum": 1},
+            "english_only": _count_where("is_chinese", False),
+            "chinese": _count_where("is_chinese", True),
+            "standalone_translations": _count_where("is_standalone_translation", True)
+        }}],
+        "voices": [
+            {"$match": {"voice": {"$nin": [None, ""]}}},
+            {"$group": {"_id": "$voice", "count": {"$sum": 1}}},
+            {"$sort": {"count": -1}}
+        ],
+        "tones": [
+            {"$match": {"tone": {"$nin": [None, ""]}}},
+            {"$group": {"_id": "$tone", "count": {"$sum": 1}}},
+            {"$sort": {"count": -1}}
+        ]
+    }}
+]
+
 logger = logging.getLogger(__name__)
 
+def build_mongo_uri(config):
+    """Build the MongoDB connection string from config values"""
+    return f"mongodb://{config['MONGODB_USER']}:{config['MONGODB_PASSWORD']}@{config['MONGODB_HOST']}:{config['MONGODB_PORT']}/"
+
 def init_db(app):
     """Initialize database connection"""
     global mongo_client, db, podcast_collection
     
     try:
-        # Build MongoDB connection string
-        mongo_uri = f"mongodb://{app.config['MONGODB_USER']}:{app.config['MONGODB_PASSWORD']}@{app.config['MONGODB_HOST']}:{app.config['MONGODB_PORT']}/"
-        
         # Connect to MongoDB
-        mongo_client = MongoClient(mongo_uri)
+        mongo_client = MongoClient(build_mongo_uri(app.config))
         db = mongo_client[app.config['MONGODB_DB']]
         podcast_collection = db["podcasts"]
         
@@ -29,6 +105,13 @@ def init_db(app):
         mongo_client = None
         db = None
         podcast_collection = None
+        return
+    
+    # Create any missing indexes the app and maintenance scripts rely on
+    try:
+        ensure_indexes(podcast_collection, retired=RETIRED_PODCAST_INDEXES)
+    except Exception as e:
+        logger.error(f"Error creating podcast indexes: {str(e)}")
 
 def get_db():
     """Get database instance"""
@@ -38,39 +121,151 @@ def get_podcast_collection():
     """Get podcast collection instance"""
     return podcast_collection
 
+def podcast_document(podcast_data):
+    """
+    The document to insert for podcast_data: each chunk not signed yet is
+    signed so later near-identical text can reuse its audio. The input is
+    not modified.
+    """
+    if not podcast_data.get('chunks'):
+        return podcast_data
+    return dict(podcast_data, chunks=[
+        chunk if 'minhash' in chunk else dict(chunk, **signature_fields(chunk.get('text')))
+        for chunk in podcast_data['chunks']
+    ])
+
 def save_podcast(podcast_data):
     """Save podcast data to database"""
     if podcast_collection is not None:
         try:
-            result = podcast_collection.insert_one(podcast_data)
+            result = podcast_collection.insert_one(podcast_document(podcast_data))
             return result.inserted_id
         except Exception as e:
             logger.error(f"Error saving podcast: {str(e)}")
     return None
 
-def get_podcast(podcast_id):
+def get_podcast(podcast_id, projection=DETAIL_PROJECTION):
     """Retrieve podcast by ID"""
     if podcast_collection is not None:
         try:
-            return podcast_collection.find_one({"_id": podcast_id})
+            return podcast_collection.find_one({"_id": podcast_id}, projection)
         except Exception as e:
             logger.error(f"Error retrieving podcast: {str(e)}")
     return None
 
-def get_all_podcasts(limit=100, skip=0):
+def get_all_podcasts(limit=100, skip=0, projection=LISTING_PROJECTION):
     """Get all podcasts with pagination"""
     if podcast_collection is not None:
         try:
-            return list(podcast_collection.find().sort("created_at", -1).skip(skip).limit(limit))
+            return list(podcast_collection.find({}, projection).sort(LIST_SORT).skip(skip).limit(limit))
         except Exception as e:
             logger.error(f"Error retrieving podcasts: {str(e)}")
     return []
 
-def get_podcast_by_chunk_id(chunk_id):
+def encode_cursor(podcast):
+    """Build a pagination cursor from a podcast's position in the listing order"""
+    return f"{podcast['created_at'].isoformat()}_{podcast['_id']}"
+
+def decode_cursor(cursor):
+    """Parse a pagination cursor into (created_at, _id)"""
+    created_at, _, object_id = cursor.rpartition('_')
+    return datetime.fromisoformat(created_at), ObjectId(object_id)
+
+def get_podcasts_page(limit=10, after=None, before=None, projection=LISTING_PROJECTION):
+    """
+    Get podcasts with keyset pagination on (created_at, _id), newest first.
+    Pass the cursor of the last record shown as after for the next page,
+    or of the first record shown as before for the previous page.
+    """
+    if podcast_collection is not None:
+        try:
+            if before:
+                created_at, object_id = decode_cursor(before)
+                query = {"$or": [
+                    {"created_at": {"$gt": created_at}},
+                    {"created_at": created_at, "_id": {"$gt": object_id}}
+                ]}
+                ascending = [("created_at", ASCENDING), ("_id", ASCENDING)]
+                podcasts = list(podcast_collection.find(query, projection).sort(ascending).limit(limit))
+                podcasts.reverse()
+                return podcasts
+            
+            query = {}
+            if after:
+                created_at, object_id = decode_cursor(after)
+                query = {"$or": [
+                    {"created_at": {"$lt": created_at}},
+                    {"created_at": created_at, "_id": {"$lt": object_id}}
+                ]}
+            return list(podcast_collection.find(query, projection).sort(LIST_SORT).limit(limit))
+        except Exception as e:
+            logger.error(f"Error retrieving podcast page: {str(e)}")
+    return []
+
+def count_podcasts():
+    """Get the number of podcasts from collection metadata, cached briefly"""
+    if podcast_collection is not None:
+        now = time.monotonic()
+        if _count_cache["value"] is not None and now < _count_cache["expires"]:
+            return _count_cache["value"]
+        try:
+            _count_cache["value"] = podcast_collection.estimated_document_count()
+            _count_cache["expires"] = now + COUNT_CACHE_SECONDS
+            return _count_cache["value"]
+        except Exception as e:
+            logger.error(f"Error counting podcasts: {str(e)}")
+    return 0
+
+def collect_podcast_stats(collection):
+    """Compute collection statistics with one $facet aggregation"""
+    result = next(collection.aggregate(STATS_PIPELINE, allowDiskUse=True))
+    totals = result["totals"][0] if result["totals"] else {}
+    return {
+        "total_records": totals.get("total_records", 0),
+        "english_only": totals.get("english_only", 0),
+        "chinese": totals.get("chinese", 0),
+        "standalone_translations": totals.get("standalone_translations", 0),
+        "voices": {group["_id"]: group["count"] for group in result["voices"]},
+        "tones": {group["_id"]: group["count"] for group in result["tones"]}
+    }
+
+def get_podcast_stats(max_age=60):
+    """Get podcast collection statistics, recomputed at most every max_age seconds"""
+    if podcast_collection is not None:
+        now = time.monotonic()
+        if _stats_cache["value"] is not None and now < _stats_cache["expires"]:
+            return _stats_cache["value"]
+        try:
+            _stats_cache["value"] = collect_podcast_stats(podcast_collection)
+            _stats_cache["expires"] = now + max_age
+            return _stats_cache["value"]
+        except Exception as e:
+            logger.error(f"Error computing podcast stats: {str(e)}")
+    return None
+
+def get_podcast_by_chunk_id(chunk_id, projection=DETAIL_PROJECTION):
     """Retrieve podcast by chunk ID"""
     if podcast_collection is not None:
         try:
-            return podcast_collection.find_one({"chunks.chunk_id": chunk_id})
+            return podcast_collection.find_one({"chunks.chunk_id": chunk_id}, projection)
         except Exception as e:
             logger.error(f"Error retrieving podcast by chunk ID: {str(e)}")
+    return None
+
+def get_podcast_audio_record(chunk_id):
+    """
+    Retrieve the stored audio of an imported podcast record: a dict with
+    audio_file_id (GridFS) or, for records not yet migrated, audio_data
+    """
+    if podcast_collection is not None:
+        try:
+            return podcast_collection.find_one(
+                {"chunk_id": chunk_id, "$or": [
+                    {"audio_file_id": {"$exists": True}},
+                    {"audio_data": {"$exists": True}}
+                ]},
+                AUDIO_PROJECTION
+            )
+        except Exception as e:
+            logger.error(f"Error retrieving audio record for chunk {chunk_id}: {str(e)}")
     return None 
\ No newline at end of file
@@ -0,0 +1,103 @@
+import time
+import logging
+
+# Group keys for duplicate detection
+# Same original text, regardless of translation
+TEXT_KEY = "$original_text"
+# Same stored content hash (original and translated text)
+HASH_KEY = "$content_hash"
+# Same original and translated text, for records without a stored hash
+# (null when there is no original text, so such records are left alone)
+CONTENT_KEY = {"$cond": [
+    {"$eq": [{"$type": "$original_text"}, "string"]},
+    {"original_text": "$original_text", "translated_text": {"$ifNull": ["$translated_text", ""]}},
+    None
+]}
+
+# Losers removed per delete_many call
+DELETE_BATCH_SIZE = 1000
+
+logger = logging.getLogger(__name__)
+
+def duplicate_pipeline(group_key):
+    """
+    Aggregation that ranks each duplicate group server-side and returns, per
+    group with more than one record, the record to keep and the ones to remove.
+    Records with audio rank first, then non-standalone records, then the newest.
+    Records where the key is missing are never grouped together.
+    """
+    has_audio = {"$or": [
+        {"$ne": [{"$type": "$audio_file_id"}, "missing"]},
+        {"$ne": [{"$type": "$audio_data"}, "missing"]}
+    ]}
+    return [
+        # Drop everything but the ranking fields before sorting, so audio blobs never reach $sort
+        {"$project": {
+            "key": group_key,
+            "created_at": 1,
+            "audio_file_id": 1,
+            "score": {"$add": [
+                {"$cond": [has_audio, 2, 0]},
+                {"$cond": [{"$ifNull": ["$is_standalone_translation", False]}, 0, 1]}
+            ]}
+        }},
+        {"$match": {"key": {"$ne": None}}},
+        {"$sort": {"score": -1, "created_at": -1, "_id": -1}},
+        {"$group": {
+            "_id": "$key",
+            "keep": {"$first": "$_id"},
+            "keep_audio_file_id": {"$first": "$audio_file_id"},
+            "count": {"$sum": 1},
+            "records": {"$push": {"id": "$_id", "audio_file_id": "$audio_file_id"}}
+        }},
+        {"$match": {"count": {"$gt": 1}}},
+        {"$project": {
+            "keep": 1,
+            "keep_audio_file_id": 1,
+            "count": 1,
+            "losers": {"$filter": {"input": "$records", "cond": {"$ne": ["$$this.id", "$keep"]}}}
+        }}
+    ]
+
+def delete_records(collection, record_ids, file_ids, bucket_name):
+    """Delete a batch of records and the GridFS files only they referenced"""
+    deleted = collection.delete_many({"_id": {"$in": record_ids}}).deleted_count
+    if file_ids:
+        db = collection.database
+        db[f"{bucket_name}.chunks"].delete_many({"files_id": {"$in": file_ids}})
+        db[f"{bucket_name}.files"].delete_many({"_id": {"$in": file_ids}})
+    return deleted
+
+def remove_duplicates(collection, group_key=TEXT_KEY, dry_run=False,
+                      batch_size=DELETE_BATCH_SIZE, bucket_name="audio"):
+    """
+    Remove duplicate records in one aggregation pass, keeping the best-ranked
+    record of each group. Losers are deleted with delete_many in batches.
+    Returns a dict with the number of groups, records removed and seconds taken.
+    """
+    start_time = time.monotonic()
+    groups = 0
+    removed = 0
+    record_ids = []
+    file_ids = []
+
+    # $group is blocking, so the collection has been fully read before we start deleting
+    for group in collection.aggregate(duplicate_pipeline(group_key), allowDiskUse=True):
+        groups += 1
+        for loser in group['losers']:
+            record_ids.append(loser['id'])
+            audio_file_id = loser.get('audio_file_id')
+            if audio_file_id and audio_file_id != group.get('keep_audio_file_id'):
+                file_ids.append(audio_file_id)
+
+        if len(record_ids) >= batch_size:
+            removed += len(record_ids) if dry_run else delete_records(collection, record_ids, file_ids, bucket_name)
+            record_ids, file_ids = [], []
+
+    if record_ids:
+        removed += len(record_ids) if dry_run else delete_records(collection, record_ids, file_ids, bucket_name)
+
+    elapsed = time.monotonic() - start_time
+    logger.info(f"{'Would remove' if dry_run else 'Removed'} {removed} duplicate records "
+                f"from {groups} groups in {elapsed:.2f}s")
+    return {"groups": groups, "removed": removed, "seconds": elapsed}
@@ -0,0 +1,38 @@
+import logging
+from gridfs import GridFSBucket
+from gridfs.errors import NoFile
+from app.services.database import get_db
+
+# Application-wide GridFS bucket for audio files
+audio_bucket = None
+
+logger = logging.getLogger(__name__)
+
+def init_gridfs(app):
+    """Initialize the GridFS audio bucket on the application database"""
+    global audio_bucket
+
+    db = get_db()
+    if db is None:
+        logger.warning("MongoDB unavailable, GridFS audio store disabled")
+        audio_bucket = None
+        return
+
+    try:
+        audio_bucket = GridFSBucket(db, bucket_name=app.config['GRIDFS_AUDIO_BUCKET'])
+        logger.info(f"GridFS audio store ready (bucket '{app.config['GRIDFS_AUDIO_BUCKET']}')")
+    except Exception as e:
+        logger.error(f"Error initializing GridFS audio store: {str(e)}")
+        audio_bucket = None
+
+def open_audio_file(file_id):
+    """Open a GridFS audio file for streaming, or None if it does not exist"""
+    if audio_bucket is None:
+        return None
+    try:
+        return audio_bucket.open_download_stream(file_id)
+    except NoFile:
+        logger.warning(f"GridFS audio file not found: {file_id}")
+    except Exception as e:
+        logger.error(f"Error opening GridFS audio file {file_id}: {str(e)}")
+    return None
@@ -0,0 +1,125 @@
+import logging
+from datetime import datetime
+from bson.objectid import ObjectId
+from pymongo import IndexModel, ASCENDING, DESCENDING
+
+# Listing order, newest first; _id breaks ties between equal timestamps
+LIST_SORT = [("created_at", DESCENDING), ("_id", DESCENDING)]
+
+# Indexes the podcasts collection needs, by name
+PODCAST_INDEXES = [
+    # Podcast listing sort and keyset pagination
+    IndexModel(LIST_SORT, name="created_at_id"),
+    # Audio and history lookups for app-generated podcasts
+    IndexModel([("chunks.chunk_id", ASCENDING)], name="chunks_chunk_id"),
+    # Imported records: audio lookups
+    IndexModel([("chunk_id", ASCENDING)], name="chunk_id"),
+    # Duplicate detection; not sparse so {$exists: false} can use it too
+    IndexModel([("content_hash", ASCENDING)], name="content_hash"),
+    # Near-duplicate candidate lookup by LSH bucket, for records and podcast chunks
+    IndexModel([("lsh_buckets", ASCENDING)], name="lsh_buckets"),
+    IndexModel([("chunks.lsh_buckets", ASCENDING)], name="chunks_lsh_buckets"),
+]
+
+# Indexes no longer used by any query, dropped if an earlier version created them.
+# original_translated_text indexed full texts for an importer check that now
+# compares content_hash values instead.
+RETIRED_PODCAST_INDEXES = ["original_translated_text"]
+
+# Indexes the GridFS audio files collection needs beyond GridFS's own
+AUDIO_FILE_INDEXES = [
+    # Migration's lookup of uploads left by an interrupted run
+    IndexModel([("metadata.podcast_id", ASCENDING)], name="metadata_podcast_id"),
+]
+
+# Representative query shapes run by the app and scripts: (name, filter, sort)
+QUERY_SHAPES = [
+    ("listing first page", {}, LIST_SORT),
+    ("listing after cursor", {"$or": [
+        {"created_at": {"$lt": datetime(2000, 1, 1)}},
+        {"created_at": datetime(2000, 1, 1), "_id": {"$lt": ObjectId()}}
+    ]}, LIST_SORT),
+    ("podcast by chunks.chunk_id", {"chunks.chunk_id": "00000000-0000-0000-0000-000000000000"}, None),
+    ("audio record by chunk_id", {"chunk_id": "00000000-0000-0000-0000-000000000000", "$or": [
+        {"audio_file_id": {"$exists": True}},
+        {"audio_data": {"$exists": True}}
+    ]}, None),
+    ("content_hash lookup", {"content_hash": "0" * 32}, None),
+    ("records missing content_hash", {"content_hash": {"$exists": False}}, None),
+    ("near-duplicate candidates", {"$or": [
+        {"lsh_buckets": {"$in": ["00" + "0" * 16]}},
+        {"chunks.lsh_buckets": {"$in": ["00" + "0" * 16]}}
+    ]}, None),
+]
+
+logger = logging.getLogger(__name__)
+
+def ensure_indexes(collection, indexes=PODCAST_INDEXES, retired=()):
+    """
+    Create any declared indexes missing from collection and return their
+    names. Indexes named in retired are dropped first.
+    """
+    info = collection.index_information()
+    for name in retired:
+        if name in info:
+            collection.drop_index(name)
+            del info[name]
+            logger.info(f"Dropped retired index {name} on {collection.name}")
+    # An index with the same keys under another name already serves the queries
+    existing_keys = {tuple(spec["key"]) for spec in info.values()}
+    missing = [
+        index for index in indexes
+        if index.document["name"] not in info
+        and tuple(index.document["key"].items()) not in existing_keys
+    ]
+    if not missing:
+        return []
+    created = collection.create_indexes(missing)
+    logger.info(f"Created indexes on {collection.name}: {', '.join(created)}")
+    return created
+
+def _plan_stages(plan):
+    """Yield every stage name in an explain() plan tree"""
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            yield plan["stage"]
+        for value in plan.values():
+            yield from _plan_stages(value)
+    elif isinstance(plan, list):
+        for item in plan:
+            yield from _plan_stages(item)
+
+def _index_names(plan):
+    """Yield the index names used by an explain() plan tree"""
+    if isinstance(plan, dict):
+        if "indexName" in plan:
+            yield plan["indexName"]
+        for value in plan.values():
+            yield from _index_names(value)
+    elif isinstance(plan, list):
+        for item in plan:
+            yield from _index_names(item)
+
+def explain_queries(collection, shapes=QUERY_SHAPES):
+    """
+    Run explain() on each query shape and summarize the winning plan.
+    Returns a list of dicts with the shape name, plan stages, index used,
+    documents examined and whether the plan falls back to a collection scan.
+    """
+    results = []
+    for name, query, sort in shapes:
+        cursor = collection.find(query, {"_id": 1}).limit(10)
+        if sort:
+            cursor = cursor.sort(sort)
+        explanation = cursor.explain()
+        winning_plan = explanation.get("queryPlanner", {}).get("winningPlan", {})
+        stages = list(_plan_stages(winning_plan))
+        index_names = sorted(set(_index_names(winning_plan)))
+        results.append({
+            "name": name,
+            "stages": stages,
+            "indexes": index_names,
+            "docs_examined": explanation.get("executionStats", {}).get("totalDocsExamined"),
+            "collscan": "COLLSCAN" in stages
+        })
+    return results
@@ -0,0 +1,242 @@
+import copy
+import time
+import uuid
+import logging
+import threading
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from pymongo import ReturnDocument
+from app.services.database import get_db, save_podcast
+
+# Application-wide job manager
+job_manager = None
+
+# Job statuses after which no chunk changes any more
+FINISHED_STATUSES = ('completed', 'partial', 'failed')
+
+logger = logging.getLogger(__name__)
+
+def _final_status(job):
+    """Status of a job whose chunks have all finished"""
+    if job['failed_chunks'] == 0:
+        return 'completed'
+    if job['completed_chunks'] == 0:
+        return 'failed'
+    return 'partial'
+
+class InMemoryJobStore:
+    """Job store kept in process memory. Jobs are lost on restart."""
+
+    def __init__(self, ttl_seconds):
+        self.ttl = timedelta(seconds=ttl_seconds)
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def _prune(self):
+        """Forget finished jobs not updated within the TTL (caller holds the lock)"""
+        cutoff = datetime.now() - self.ttl
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job['status'] in FINISHED_STATUSES and job['updated_at'] < cutoff
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def create(self, job):
+        with self._lock:
+            self._prune()
+            self._jobs[job['job_id']] = copy.deepcopy(job)
+
+    def get(self, job_id):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return copy.deepcopy(job) if job is not None else None
+
+    def start_chunk(self, job_id, index):
+        with self._lock:
+            job = self._jobs[job_id]
+            job['chunks'][index]['status'] = 'processing'
+            job['status'] = 'running'
+            job['updated_at'] = datetime.now()
+
+    def finish_chunk(self, job_id, index, fields, failed):
+        """Record a chunk result and return the updated job"""
+        with self._lock:
+            job = self._jobs[job_id]
+            job['chunks'][index].update(fields)
+            job['failed_chunks' if failed else 'completed_chunks'] += 1
+            if job['completed_chunks'] + job['failed_chunks'] == job['total_chunks']:
+                job['status'] = _final_status(job)
+            job['updated_at'] = datetime.now()
+            return copy.deepcopy(job)
+
+class MongoJobStore:
+    """Job store backed by a MongoDB collection, shared by all worker processes"""
+
+    def __init__(self, collection, ttl_seconds):
+        self.collection = collection
+        self.collection.create_index('job_id', unique=True)
+        self.collection.create_index('created_at', expireAfterSeconds=ttl_seconds)
+
+    def create(self, job):
+        self.collection.insert_one(copy.deepcopy(job))
+
+    def get(self, job_id):
+        return self.collection.find_one({'job_id': job_id}, {'_id': 0})
+
+    def start_chunk(self, job_id, index):
+        self.collection.update_one(
+            {'job_id': job_id},
+            {'$set': {
+                f'chunks.{index}.status': 'processing',
+                'status': 'running',
+                'updated_at': datetime.now()
+            }}
+        )
+
+    def finish_chunk(self, job_id, index, fields, failed):
+        """Record a chunk result and return the updated job"""
+        job = self.collection.find_one_and_update(
+            {'job_id': job_id},
+            {
+                '$set': dict({f'chunks.{index}.{key}': value for key, value in fields.items()},
+                             updated_at=datetime.now()),
+                '$inc': {'failed_chunks' if failed else 'completed_chunks': 1}
+            },
+            projection={'_id': 0},
+            return_document=ReturnDocument.AFTER
+        )
+        if job['completed_chunks'] + job['failed_chunks'] == job['total_chunks']:
+            job['status'] = _final_status(job)
+            self.collection.update_one({'job_id': job_id}, {'$set': {'status': job['status']}})
+        return job
+
+class JobManager:
+    """Runs audio generation jobs on a background worker pool, one task per chunk"""
+
+    def __init__(self, store, max_workers):
+        self.store = store
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='audio-job')
+        # Bumped whenever a chunk in this process finishes, to wake event streams
+        self._version = 0
+        self._updated = threading.Condition()
+
+    def submit(self, processor, texts, voice, tone, is_chinese, title='Untitled Podcast', source_url=''):
+        """Queue audio generation for each text and return the job ID immediately"""
+        now = datetime.now()
+        job = {
+            'job_id': str(uuid.uuid4()),
+            'status': 'queued',
+            'title': title,
+            'voice': voice,
+            'tone': tone,
+            'is_chinese': is_chinese,
+            'source_url': source_url,
+            'chunks': [{'index': index, 'text': text, 'status': 'pending'} for index, text in enumerate(texts)],
+            'total_chunks': len(texts),
+            'completed_chunks': 0,
+            'failed_chunks': 0,
+            'created_at': now,
+            'updated_at': now
+        }
+        self.store.create(job)
+
+        for index, text in enumerate(texts):
+            self.executor.submit(self._run_chunk, processor, job['job_id'], index, text, voice, tone, is_chinese)
+
+        logger.info(f"Queued job {job['job_id']} with {len(texts)} chunks")
+        return job['job_id']
+
+    def get(self, job_id):
+        """Get a job with per-chunk progress, or None if unknown"""
+        return self.store.get(job_id)
+
+    def wait_for_update(self, version, timeout):
+        """
+        Block until a chunk finishes after version was read, or timeout
+        seconds pass. Returns the current version. Chunks run by other
+        worker processes don't wake this, so callers should re-read the
+        store after a timeout too.
+        """
+        with self._updated:
+            self._updated.wait_for(lambda: self._version != version, timeout)
+            return self._version
+
+    def _notify(self):
+        with self._updated:
+            self._version += 1
+            self._updated.notify_all()
+
+    def _run_chunk(self, processor, job_id, index, text, voice, tone, is_chinese):
+        try:
+            self.store.start_chunk(job_id, index)
+            chunk_id = str(uuid.uuid4())
+            start_time = time.monotonic()
+            result = processor.generate_audio(text, voice, tone, is_chinese, chunk_id)
+            if result['success']:
+                fields = {
+                    'status': 'done',
+                    'chunk_id': chunk_id,
+                    'filename': result['filename'],
+                    'audio_url': f"/audio/{result['filename']}",
+                    'cached': result.get('cached', False)
+                }
+            else:
+                fields = {'status': 'failed', 'error': result['error']}
+            fields['duration_seconds'] = round(time.monotonic() - start_time, 3)
+            fields['finished_at'] = datetime.now()
+            job = self.store.finish_chunk(job_id, index, fields, not result['success'])
+            self._notify()
+
+            if job['status'] in ('completed', 'partial'):
+                self._save_podcast(job)
+        except Exception as e:
+            logger.error(f"Error running chunk {index} of job {job_id}: {str(e)}")
+
+    @staticmethod
+    def _save_podcast(job):
+        """Save a finished job's successful chunks as a podcast"""
+        save_podcast({
+            'id': job['job_id'],
+            'title': job['title'],
+            'voice': job['voice'],
+            'tone': job['tone'],
+            'is_chinese': job['is_chinese'],
+            'source_url': job['source_url'],
+            'chunks': [
+                {
+                    'chunk_id': chunk['chunk_id'],
+                    'text': chunk['text'],
+                    'filename': chunk['filename'],
+                    'processed': True
+                }
+                for chunk in job['chunks'] if chunk['status'] == 'done'
+            ],
+            'created_at': datetime.now()
+        })
+        logger.info(f"Job {job['job_id']} finished with status {job['status']}")
+
+def init_jobs(app):
+    """Initialize the job store and background worker pool"""
+    global job_manager
+
+    store = None
+    if app.config['JOB_STORE'] == 'mongodb':
+        db = get_db()
+        if db is not None:
+            try:
+                store = MongoJobStore(db['jobs'], app.config['JOB_TTL_SECONDS'])
+                logger.info("Using MongoDB job store")
+            except Exception as e:
+                logger.error(f"Error initializing MongoDB job store: {str(e)}")
+        else:
+            logger.warning("MongoDB unavailable, falling back to in-memory job store")
+
+    if store is None:
+        store = InMemoryJobStore(app.config['JOB_TTL_SECONDS'])
+
+    job_manager = JobManager(store, app.config['JOB_WORKERS'])
+
+def get_job_manager():
+    """Get the job manager instance"""
+    return job_manager
@@ -0,0 +1,259 @@
+import re
+import time
+import struct
+import random
+import hashlib
+import logging
+import unicodedata
+from datetime import datetime
+from pymongo import UpdateOne
+from app.services.dedup import delete_records, DELETE_BATCH_SIZE
+
+# MinHash signature size, split into LSH bands of ROWS values each.
+# 16 bands of 8 rows make pairs with Jaccard similarity above ~0.7 likely
+# to share a bucket while dissimilar pairs almost never do.
+NUM_PERM = 128
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+
+# Characters per shingle, taken after normalization
+SHINGLE_SIZE = 5
+
+# Fixed seed: signatures are stored, so they must be comparable across processes and runs
+_rng = random.Random(0x5eed)
+_MASKS = [_rng.getrandbits(64) for _ in range(NUM_PERM)]
+
+# Anything but letters and digits; dropped so whitespace and punctuation changes don't matter
+NON_WORD_PATTERN = re.compile(r'[\W_]+')
+
+# Signature packing for storage
+SIGNATURE_FORMAT = f'<{NUM_PERM}Q'
+
+# Records with original text that have not been signed yet
+UNSIGNED_QUERY = {'minhash': {'$exists': False}, 'original_text': {'$type': 'string'}}
+
+# Most candidate documents examined per near-duplicate lookup
+MAX_CANDIDATES = 50
+
+logger = logging.getLogger(__name__)
+
+def normalize(text):
+    """Case-fold text and strip everything but letters and digits"""
+    return NON_WORD_PATTERN.sub('', unicodedata.normalize('NFKC', text).casefold())
+
+def _shingle_hashes(text):
+    """64-bit hashes of the character shingles of normalized text"""
+    normalized = normalize(text)
+    if not normalized:
+        return []
+    shingles = {normalized[i:i + SHINGLE_SIZE] for i in range(max(1, len(normalized) - SHINGLE_SIZE + 1))}
+    return [int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(), 'little')
+            for shingle in shingles]
+
+def signature(text):
+    """
+    MinHash signature of text as a tuple of NUM_PERM integers, or None for
+    text with no letters or digits. Each position XORs the shingle hashes
+    with a fixed random mask and keeps the minimum, which runs in C.
+    """
+    hashes = _shingle_hashes(text)
+    if not hashes:
+        return None
+    return tuple(min(map(mask.__xor__, hashes)) for mask in _MASKS)
+
+def lsh_buckets(sig):
+    """LSH bucket keys for a signature, one per band"""
+    buckets = []
+    for band in range(BANDS):
+        rows = struct.pack(f'<{ROWS}Q', *sig[band * ROWS:(band + 1) * ROWS])
+        buckets.append(f"{band:02d}{hashlib.blake2b(rows, digest_size=8).hexdigest()}")
+    return buckets
+
+def similarity(sig_a, sig_b):
+    """Estimated Jaccard similarity of two signatures"""
+    return sum(a == b for a, b in zip(sig_a, sig_b)) / NUM_PERM
+
+def signature_fields(text, sig=None):
+    """
+    Fields to store on a record or chunk so it can be found as a near-duplicate.
+    Pass sig when the signature of text was already computed.
+    """
+    if sig is None:
+        sig = signature(text or '')
+    if sig is None:
+        return {}
+    return {'minhash': struct.pack(SIGNATURE_FORMAT, *sig), 'lsh_buckets': lsh_buckets(sig)}
+
+def unpack_signature(packed):
+    return struct.unpack(SIGNATURE_FORMAT, packed)
+
+def find_same_text(collection, text, query=None, limit=MAX_CANDIDATES, sig=None):
+    """
+    Find stored podcast chunks whose text is the same as text once
+    normalized (case, whitespace and punctuation aside). LSH buckets only
+    select candidates (matching query, e.g. voice settings); a chunk is
+    returned only if its normalized text is exactly equal, because any
+    similarity below 1.0 means the words differ. Pass sig when the
+    signature of text was already computed. Returns chunk IDs.
+    """
+    if sig is None:
+        sig = signature(text)
+    if sig is None:
+        return []
+    buckets = lsh_buckets(sig)
+    normalized = normalize(text)
+
+    candidate_query = dict(query or {})
+    candidate_query['chunks.lsh_buckets'] = {'$in': buckets}
+    cursor = collection.find(candidate_query, {'chunks.chunk_id': 1, 'chunks.text': 1}).limit(limit)
+
+    matches = []
+    for record in cursor:
+        for chunk in record.get('chunks', []):
+            if chunk.get('chunk_id') and isinstance(chunk.get('text'), str) and normalize(chunk['text']) == normalized:
+                matches.append(chunk['chunk_id'])
+    return matches
+
+def add_missing_signatures(collection, batch_size=1000):
+    """Store signatures on records with original text but no signature yet"""
+    cursor = collection.find(UNSIGNED_QUERY, {'original_text': 1})
+    updated = 0
+    operations = []
+    for record in cursor:
+        fields = signature_fields(record['original_text'])
+        if fields:
+            operations.append(UpdateOne({'_id': record['_id']}, {'$set': fields}))
+        if len(operations) >= batch_size:
+            updated += collection.bulk_write(operations, ordered=False).modified_count
+            operations = []
+    if operations:
+        updated += collection.bulk_write(operations, ordered=False).modified_count
+    if updated:
+        logger.info(f"Added MinHash signatures to {updated} records")
+    return updated
+
+def _rank(record):
+    """Records with audio first, then non-standalone records, then the newest"""
+    has_audio = 'audio_file_id' in record or record.get('has_audio_data', False)
+    score = (2 if has_audio else 0) + (0 if record.get('is_standalone_translation', False) else 1)
+    return (score, record.get('created_at') or datetime.min)
+
+def find_near_duplicate_clusters(collection, threshold=0.85):
+    """
+    Group records into clusters of near-duplicates.
+    Candidate pairs come from records sharing an LSH bucket (grouped
+    server-side); pairs whose estimated similarity reaches threshold are
+    joined with union-find. Every member of a returned cluster reaches
+    threshold against its first, best-ranked record. Returns lists of
+    records, best-ranked first.
+    """
+    pipeline = [
+        {'$match': {'lsh_buckets': {'$exists': True}}},
+        {'$project': {'lsh_buckets': 1}},
+        {'$unwind': '$lsh_buckets'},
+        {'$group': {'_id': '$lsh_buckets', 'ids': {'$push': '$_id'}}},
+        {'$match': {'ids.1': {'$exists': True}}}
+    ]
+    buckets = [group['ids'] for group in collection.aggregate(pipeline, allowDiskUse=True)]
+    if not buckets:
+        return []
+
+    candidate_ids = list({record_id for ids in buckets for record_id in ids})
+    records = {}
+    for start in range(0, len(candidate_ids), 1000):
+        cursor = collection.find(
+            {'_id': {'$in': candidate_ids[start:start + 1000]}},
+            {'minhash': 1, 'created_at': 1, 'audio_file_id': 1, 'is_standalone_translation': 1,
+             'has_audio_data': {'$ne': [{'$type': '$audio_data'}, 'missing']}}
+        )
+        for record in cursor:
+            record['signature'] = unpack_signature(record['minhash'])
+            records[record['_id']] = record
+
+    parent = {}
+
+    def find(record_id):
+        while parent.get(record_id, record_id) != record_id:
+            record_id = parent[record_id]
+        return record_id
+
+    checked = set()
+    for ids in buckets:
+        for i, first in enumerate(ids):
+            for second in ids[i + 1:]:
+                pair = (first, second) if str(first) < str(second) else (second, first)
+                if pair in checked or first not in records or second not in records:
+                    continue
+                checked.add(pair)
+                if similarity(records[first]['signature'], records[second]['signature']) >= threshold:
+                    parent[find(first)] = find(second)
+
+    components = {}
+    for record_id in parent:
+        components.setdefault(find(record_id), []).append(records[record_id])
+    for root in list(components):
+        if root not in parent:
+            components[root].append(records[root])
+
+    # Union-find links chains (A~B, B~C with C unlike A), so split each
+    # component around its best-ranked record: a cluster is that record and
+    # the members similar to it; the rest are clustered again the same way
+    clusters = []
+    for component in components.values():
+        remaining = sorted(component, key=_rank, reverse=True)
+        while len(remaining) > 1:
+            keep = remaining[0]
+            cluster = [keep]
+            rest = []
+            for record in remaining[1:]:
+                if similarity(keep['signature'], record['signature']) >= threshold:
+                    cluster.append(record)
+                else:
+                    rest.append(record)
+            if len(cluster) > 1:
+                clusters.append(cluster)
+            remaining = rest
+    return clusters
+
+def remove_near_duplicates(collection, threshold=0.85, dry_run=False,
+                           batch_size=DELETE_BATCH_SIZE, bucket_name='audio'):
+    """
+    Remove near-duplicate records, keeping the best-ranked record of each
+    cluster. Signatures are added first to records stored without one.
+    A dry run adds no signatures and reports how many records it could not check.
+    Returns a dict with the number of clusters, records removed, unsigned
+    records skipped and seconds taken.
+    """
+    start_time = time.monotonic()
+    if dry_run:
+        # Not signed until a real run, so not part of the clusters below
+        unsigned = collection.count_documents(UNSIGNED_QUERY)
+        if unsigned:
+            logger.warning(f"{unsigned} records have no signature yet and are not checked in a dry run")
+    else:
+        unsigned = 0
+        add_missing_signatures(collection)
+    clusters = find_near_duplicate_clusters(collection, threshold)
+
+    removed = 0
+    record_ids = []
+    file_ids = []
+    for cluster in clusters:
+        keep = cluster[0]
+        logger.info(f"{'Would keep' if dry_run else 'Keeping'} record {keep['_id']} of {len(cluster)} near-duplicates")
+        for record in cluster[1:]:
+            record_ids.append(record['_id'])
+            if record.get('audio_file_id') and record['audio_file_id'] != keep.get('audio_file_id'):
+                file_ids.append(record['audio_file_id'])
+
+        if len(record_ids) >= batch_size:
+            removed += len(record_ids) if dry_run else delete_records(collection, record_ids, file_ids, bucket_name)
+            record_ids, file_ids = [], []
+
+    if record_ids:
+        removed += len(record_ids) if dry_run else delete_records(collection, record_ids, file_ids, bucket_name)
+
+    elapsed = time.monotonic() - start_time
+    logger.info(f"{'Would remove' if dry_run else 'Removed'} {removed} near-duplicate records "
+                f"from {len(clusters)} clusters in {elapsed:.2f}s")
+    return {'clusters': len(clusters), 'removed': removed, 'unsigned': unsigned, 'seconds': elapsed}
@@ -0,0 +1,85 @@
+import httpx
+import logging
+from openai import OpenAI, AsyncOpenAI
+from app.utils.rate_limiter import RateLimiter
+
+# Application-wide OpenAI client sharing one HTTP connection pool
+openai_client = None
+
+# Application-wide limit on speech requests (None when unlimited)
+tts_rate_limiter = None
+
+logger = logging.getLogger(__name__)
+
+def build_openai_client(config):
+    """Build an OpenAI client with a pooled, keep-alive HTTP transport from config values"""
+    http_client = httpx.Client(
+        limits=httpx.Limits(
+            max_connections=config['OPENAI_MAX_CONNECTIONS'],
+            max_keepalive_connections=config['OPENAI_MAX_KEEPALIVE_CONNECTIONS'],
+            keepalive_expiry=config['OPENAI_KEEPALIVE_EXPIRY']
+        ),
+        timeout=httpx.Timeout(
+            config['OPENAI_TIMEOUT'],
+            connect=config['OPENAI_CONNECT_TIMEOUT']
+        )
+    )
+
+    # Retries use the SDK's exponential backoff with jitter on connection
+    # errors, 408/409/429 and 5xx responses
+    return OpenAI(
+        api_key=config['OPENAI_API_KEY'],
+        base_url=config['OPENAI_BASE_URL'],
+        max_retries=config['OPENAI_MAX_RETRIES'],
+        http_client=http_client
+    )
+
+def build_async_openai_client(config):
+    """
+    Build an AsyncOpenAI client for the async API. Its pool is sized for many
+    concurrent requests from one event loop rather than one per thread.
+    """
+    http_client = httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=config['ASYNC_OPENAI_MAX_CONNECTIONS'],
+            max_keepalive_connections=config['ASYNC_OPENAI_MAX_CONNECTIONS'],
+            keepalive_expiry=config['OPENAI_KEEPALIVE_EXPIRY']
+        ),
+        timeout=httpx.Timeout(
+            config['OPENAI_TIMEOUT'],
+            connect=config['OPENAI_CONNECT_TIMEOUT']
+        )
+    )
+
+    return AsyncOpenAI(
+        api_key=config['OPENAI_API_KEY'],
+        base_url=config['OPENAI_BASE_URL'],
+        max_retries=config['OPENAI_MAX_RETRIES'],
+        http_client=http_client
+    )
+
+def init_openai_client(app):
+    """Initialize the shared OpenAI client and speech rate limiter"""
+    global openai_client, tts_rate_limiter
+    
+    # This process's share of the server-wide limit
+    requests_per_minute = app.config['TTS_REQUESTS_PER_MINUTE'] / max(1, app.config['SERVER_PROCESSES'])
+    tts_rate_limiter = RateLimiter(requests_per_minute, 60.0) if requests_per_minute > 0 else None
+
+    try:
+        openai_client = build_openai_client(app.config)
+        logger.info(f"OpenAI client initialized (pool size {app.config['OPENAI_MAX_CONNECTIONS']}, "
+                    f"max retries {app.config['OPENAI_MAX_RETRIES']})")
+    except Exception as e:
+        logger.error(f"Error initializing OpenAI client: {str(e)}")
+        openai_client = None
+
+def get_openai_client():
+    """Get the shared OpenAI client instance"""
+    if openai_client is None:
+        raise RuntimeError("OpenAI client is not configured. Please set your OpenAI API key.")
+    return openai_client
+
+def get_tts_rate_limiter():
+    """Get the speech request rate limiter (None when unlimited)"""
+    return tts_rate_limiter
@@ -0,0 +1,99 @@
+import uuid
+import logging
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
+
+logger = logging.getLogger(__name__)
+
+def _completed(result):
+    """A future that already holds result"""
+    future = Future()
+    future.set_result(result)
+    return future
+
+def _chunk_result(index, text, translated_text, translation_cached, chunk_id, future):
+    """The result dict for a chunk whose speech future has finished"""
+    try:
+        result = future.result()
+    except Exception as e:
+        result = {"success": False, "error": str(e)}
+
+    chunk = {
+        'index': index,
+        'text': text,
+        'translated_text': translated_text,
+        'translation_cached': translation_cached,
+        'success': result['success']
+    }
+    if result['success']:
+        chunk['chunk_id'] = chunk_id
+        chunk['filename'] = result['filename']
+        chunk['audio_url'] = f"/audio/{result['filename']}"
+        chunk['cached'] = result.get('cached', False)
+    else:
+        chunk['error'] = result['error']
+    return chunk
+
+def translate_and_synthesize(processor, translator, texts, voice, tone, target_language,
+                             translate_workers=4, synthesis_workers=4, on_abandon=None):
+    """
+    Translate each text and synthesize the translation, overlapping the two
+    stages: a chunk's speech request is issued the moment its translation
+    arrives, while later chunks are still being translated.
+
+    Yields one result dict per chunk, in chunk order, as soon as that chunk's
+    audio is ready (and every earlier chunk has been yielded). If the caller
+    stops iterating (close()), work not yet started is cancelled, speech
+    requests already running are waited for, and on_abandon is called with
+    the result dicts of those chunks so their audio is not lost.
+    """
+    translate_pool = ThreadPoolExecutor(max_workers=translate_workers, thread_name_prefix='pipeline-translate')
+    synthesis_pool = ThreadPoolExecutor(max_workers=synthesis_workers, thread_name_prefix='pipeline-tts')
+    translated = {}
+    syntheses = {}
+    chunk_ids = {}
+    try:
+        translations = {
+            translate_pool.submit(translator.translate, text, target_language): index
+            for index, text in enumerate(texts)
+        }
+        next_index = 0
+
+        while next_index < len(texts):
+            waiting = set(translations)
+            if next_index in syntheses:
+                waiting.add(syntheses[next_index])
+            done, _ = wait(waiting, return_when=FIRST_COMPLETED)
+
+            # Hand finished translations straight to the speech pool
+            for future in done & set(translations):
+                index = translations.pop(future)
+                try:
+                    translated[index] = future.result()
+                except Exception as e:
+                    logger.error(f"Error translating chunk {index}: {str(e)}")
+                    translated[index] = (None, False)
+                    syntheses[index] = _completed({"success": False, "error": f"Translation failed: {str(e)}"})
+                    continue
+                chunk_ids[index] = str(uuid.uuid4())
+                syntheses[index] = synthesis_pool.submit(
+                    processor.generate_audio, translated[index][0], voice, tone, True, chunk_ids[index])
+
+            # Release every chunk whose audio is ready, in order
+            while next_index in syntheses and syntheses[next_index].done():
+                translated_text, translation_cached = translated.pop(next_index)
+                yield _chunk_result(next_index, texts[next_index], translated_text, translation_cached,
+                                    chunk_ids.get(next_index), syntheses.pop(next_index))
+                next_index += 1
+    finally:
+        translate_pool.shutdown(wait=False, cancel_futures=True)
+        # Speech requests already running are paid for: let them finish
+        synthesis_pool.shutdown(wait=True, cancel_futures=True)
+        if on_abandon is not None and syntheses:
+            abandoned = [
+                _chunk_result(index, texts[index], *translated[index], chunk_ids.get(index), future)
+                for index, future in sorted(syntheses.items())
+                if not future.cancelled()
+            ]
+            if abandoned:
+                logger.info(f"Kept {len(abandoned)} chunks synthesized after the caller stopped")
+                on_abandon(abandoned)
@@ -0,0 +1,222 @@
+import os
+import re
+import json
+import time
+import uuid
+import secrets
+import logging
+from datetime import datetime, timezone
+from flask.json.tag import TaggedJSONSerializer
+from flask.sessions import SessionInterface, SessionMixin
+from werkzeug.datastructures import CallbackDict
+from app.services.database import get_db
+
+# Session IDs are random URL-safe tokens; anything else in the cookie is ignored
+SESSION_ID_PATTERN = re.compile(r'^[A-Za-z0-9_-]{32,64}$')
+
+logger = logging.getLogger(__name__)
+
+class ServerSideSession(CallbackDict, SessionMixin):
+    """Session whose data lives on the server; the cookie only carries its ID"""
+
+    def __init__(self, initial=None, sid=None, new=False):
+        def on_update(self):
+            self.modified = True
+        CallbackDict.__init__(self, initial, on_update)
+        self.sid = sid
+        self.new = new
+        self.modified = False
+        self.cleared = False
+
+    def clear(self):
+        """Empty the session; it gets a new ID when saved"""
+        super().clear()
+        self.cleared = True
+
+class FileSessionStore:
+    """Stores each session as a JSON file with an expiry timestamp"""
+
+    # Sweep expired files after this many saves
+    CLEANUP_INTERVAL = 500
+
+    # Temporary files older than this (seconds) were left by an interrupted save
+    STALE_TMP_AGE = 3600
+
+    def __init__(self, directory):
+        self.directory = directory
+        self._saves = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, sid):
+        return os.path.join(self.directory, sid)
+
+    def load(self, sid):
+        try:
+            with open(self._path(sid), 'r', encoding='utf-8') as f:
+                record = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if record['expires'] < time.time():
+            self.delete(sid)
+            return None
+        return record['data']
+
+    def save(self, sid, data, expires_at):
+        path = self._path(sid)
+        tmp_path = f"{path}.{uuid.uuid4()}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'expires': expires_at.timestamp(), 'data': data}, f)
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+
+        self._saves += 1
+        if self._saves % self.CLEANUP_INTERVAL == 0:
+            self.cleanup()
+
+    def touch(self, sid, expires_at):
+        data = self.load(sid)
+        if data is not None:
+            self.save(sid, data, expires_at)
+
+    def delete(self, sid):
+        try:
+            os.remove(self._path(sid))
+        except OSError:
+            pass
+
+    def cleanup(self):
+        """Remove expired session files and stale temporary files"""
+        removed = 0
+        stale_before = time.time() - self.STALE_TMP_AGE
+        for entry in os.scandir(self.directory):
+            if not entry.is_file():
+                continue
+            if SESSION_ID_PATTERN.match(entry.name) and self.load(entry.name) is None:
+                removed += 1
+            elif entry.name.endswith('.tmp'):
+                try:
+                    if entry.stat().st_mtime < stale_before:
+                        os.remove(entry.path)
+                        removed += 1
+                except OSError:
+                    pass
+        if removed:
+            logger.info(f"Removed {removed} expired session files")
+
+class MongoSessionStore:
+    """Stores sessions in a MongoDB collection with a TTL index on expiry"""
+
+    def __init__(self, collection):
+        self.collection = collection
+        self.collection.create_index('expires_at', expireAfterSeconds=0)
+
+    def load(self, sid):
+        record = self.collection.find_one({'_id': sid, 'expires_at': {'$gt': datetime.now(timezone.utc)}})
+        return record['data'] if record else None
+
+    def save(self, sid, data, expires_at):
+        self.collection.update_one(
+            {'_id': sid},
+            {'$set': {'data': data, 'expires_at': expires_at}},
+            upsert=True
+        )
+
+    def touch(self, sid, expires_at):
+        self.collection.update_one({'_id': sid}, {'$set': {'expires_at': expires_at}})
+
+    def delete(self, sid):
+        self.collection.delete_one({'_id': sid})
+
+class ServerSideSessionInterface(SessionInterface):
+    """Keeps session data in a server-side store keyed by a small session ID cookie"""
+
+    serializer = TaggedJSONSerializer()
+
+    def __init__(self, store):
+        self.store = store
+
+    def open_session(self, app, request):
+        sid = request.cookies.get(self.get_cookie_name(app))
+        if sid and SESSION_ID_PATTERN.match(sid):
+            try:
+                data = self.store.load(sid)
+            except Exception as e:
+                logger.error(f"Error loading session: {str(e)}")
+                data = None
+            if data is not None:
+                return ServerSideSession(self.serializer.loads(data), sid=sid)
+        return ServerSideSession(sid=secrets.token_urlsafe(32), new=True)
+
+    def save_session(self, app, session, response):
+        name = self.get_cookie_name(app)
+        domain = self.get_cookie_domain(app)
+        path = self.get_cookie_path(app)
+
+        # A cleared session never reuses its old ID
+        if session.cleared and not session.new:
+            try:
+                self.store.delete(session.sid)
+            except Exception as e:
+                logger.error(f"Error deleting session: {str(e)}")
+            if not session:
+                response.delete_cookie(name, domain=domain, path=path)
+                return
+            session.sid = secrets.token_urlsafe(32)
+            session.new = True
+
+        # Remove emptied sessions
+        if not session:
+            if session.modified and not session.new:
+                self.store.delete(session.sid)
+                response.delete_cookie(name, domain=domain, path=path)
+            return
+
+        if not self.should_set_cookie(app, session):
+            return
+
+        expires_at = datetime.now(timezone.utc) + app.permanent_session_lifetime
+        try:
+            if session.modified or session.new:
+                self.store.save(session.sid, self.serializer.dumps(dict(session)), expires_at)
+            else:
+                self.store.touch(session.sid, expires_at)
+        except Exception as e:
+            logger.error(f"Error saving session: {str(e)}")
+            return
+
+        response.set_cookie(
+            name,
+            session.sid,
+            expires=self.get_expiration_time(app, session),
+            httponly=self.get_cookie_httponly(app),
+            domain=domain,
+            path=path,
+            secure=self.get_cookie_secure(app),
+            samesite=self.get_cookie_samesite(app)
+        )
+
+def init_session(app):
+    """Replace the signed-cookie session with the configured server-side store"""
+    store = None
+    if app.config['SESSION_TYPE'] == 'mongodb':
+        db = get_db()
+        if db is not None:
+            try:
+                store = MongoSessionStore(db['sessions'])
+                logger.info("Using MongoDB session store")
+            except Exception as e:
+                logger.error(f"Error initializing MongoDB session store: {str(e)}")
+        else:
+            logger.warning("MongoDB unavailable, falling back to filesystem session store")
+
+    if store is None:
+        store = FileSessionStore(app.config['SESSION_FILE_DIR'])
+        logger.info(f"Using filesystem session store in {app.config['SESSION_FILE_DIR']}")
+
+    app.session_interface = ServerSideSessionInterface(store)
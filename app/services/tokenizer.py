@@ -0,0 +1,43 @@
+import threading
+import logging
+import tiktoken
+
+# Model used for token counting when none is given
+DEFAULT_MODEL = "gpt-4o"
+
+# Process-wide encodings keyed by model name
+_encodings = {}
+_encodings_lock = threading.Lock()
+
+logger = logging.getLogger(__name__)
+
+def get_encoding(model=DEFAULT_MODEL):
+    """Get the tiktoken encoding for a model, loading it only once per process"""
+    encoding = _encodings.get(model)
+    if encoding is None:
+        with _encodings_lock:
+            encoding = _encodings.get(model)
+            if encoding is None:
+                encoding = tiktoken.encoding_for_model(model)
+                _encodings[model] = encoding
+                logger.info(f"Loaded tiktoken encoding '{encoding.name}' for model {model}")
+    return encoding
+
+def init_tokenizer(app):
+    """Warm up the encodings listed in the app config so requests never pay the load cost"""
+    for model in app.config['TOKENIZER_MODELS']:
+        try:
+            get_encoding(model)
+        except Exception as e:
+            logger.error(f"Error loading encoding for model {model}: {str(e)}")
+
+def count_tokens(text, model=DEFAULT_MODEL):
+    """Returns the number of tokens in a text string"""
+    return len(get_encoding(model).encode(text))
+
+def count_tokens_batch(texts, model=DEFAULT_MODEL, num_threads=8):
+    """Returns the number of tokens in each string, encoding them across threads"""
+    if not texts:
+        return []
+    encoded = get_encoding(model).encode_batch(list(texts), num_threads=num_threads)
+    return [len(tokens) for tokens in encoded]
@@ -0,0 +1,250 @@
+import json
+import time
+import asyncio
+import hashlib
+import logging
+import threading
+import unicodedata
+from datetime import datetime, timezone
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from app.services.database import get_db
+
+# Application-wide translation cache
+translation_cache = None
+
+# Chat model used for translation
+TRANSLATION_MODEL = "gpt-4o"
+
+logger = logging.getLogger(__name__)
+
+class TranslationCache:
+    """
+    Content-addressed translation cache: an in-memory LRU in front of an
+    optional MongoDB collection whose TTL index expires old entries.
+    Both tiers expire entries ttl_seconds after they were stored.
+    The collection is shared by all worker processes.
+    """
+
+    def __init__(self, collection=None, max_entries=1000, ttl_seconds=30 * 24 * 3600):
+        self.collection = collection
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # key -> (translated text, expiry time), least recently used first
+        self._lock = threading.Lock()
+
+        if self.collection is not None:
+            self.collection.create_index('created_at', expireAfterSeconds=ttl_seconds)
+
+    @staticmethod
+    def make_key(text, target_language, model):
+        """
+        Hash the normalized text together with the target language and model.
+        Runs of spaces and tabs are collapsed, but line breaks are kept, since
+        the translation reproduces them.
+        """
+        lines = unicodedata.normalize("NFC", text).splitlines()
+        normalized = "\n".join(" ".join(line.split()) for line in lines).strip()
+        payload = json.dumps([normalized, target_language, model], ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _remember(self, key, translated_text, expires_at):
+        """Add an entry to the in-memory LRU (caller holds the lock)"""
+        self._entries[key] = (translated_text, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def get(self, key):
+        """Return the cached translation for key, or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[1] > time.time():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[0]
+                del self._entries[key]
+
+        record = None
+        if self.collection is not None:
+            try:
+                record = self.collection.find_one({'_id': key}, {'translated_text': 1, 'created_at': 1})
+            except Exception as e:
+                logger.error(f"Error reading translation cache: {str(e)}")
+
+        # MongoDB removes expired documents in the background, so check the age here too
+        expires_at = None
+        if record is not None and isinstance(record.get('created_at'), datetime):
+            expires_at = record['created_at'].replace(tzinfo=timezone.utc).timestamp() + self.ttl_seconds
+        with self._lock:
+            if record is None or expires_at is None or expires_at <= time.time():
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._remember(key, record['translated_text'], expires_at)
+        return record['translated_text']
+
+    def put(self, key, translated_text, target_language, model):
+        """Store a translation under key"""
+        with self._lock:
+            self._remember(key, translated_text, time.time() + self.ttl_seconds)
+
+        if self.collection is not None:
+            try:
+                self.collection.update_one(
+                    {'_id': key},
+                    {'$set': {
+                        'translated_text': translated_text,
+                        'target_language': target_language,
+                        'model': model,
+                        'created_at': datetime.now(timezone.utc)  # TTL indexes compare in UTC
+                    }},
+                    upsert=True
+                )
+            except Exception as e:
+                logger.error(f"Error writing translation cache: {str(e)}")
+
+    def stats(self):
+        """Return hit/miss counters and current usage"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "persistent": self.collection is not None
+            }
+
+class Translator:
+    """Translates text with a chat model, consulting the translation cache first"""
+
+    def __init__(self, client, cache=None, model=TRANSLATION_MODEL):
+        self.client = client
+        self.cache = cache
+        self.model = model
+
+    @staticmethod
+    def _messages(text, target_language):
+        """Chat messages asking the model to translate text"""
+        return [
+            {"role": "system", "content": f"You are a translator. Translate the following text to {target_language}. Preserve the meaning, tone, and style of the original text."},
+            {"role": "user", "content": text}
+        ]
+
+    def translate(self, text, target_language):
+        """Translate one piece of text. Returns (translated_text, cached)."""
+        key = TranslationCache.make_key(text, target_language, self.model)
+        if self.cache is not None:
+            translated_text = self.cache.get(key)
+            if translated_text is not None:
+                return translated_text, True
+
+        response = self.client.chat.completions.create(
+            model=self.model,
+            messages=self._messages(text, target_language)
+        )
+        translated_text = response.choices[0].message.content
+
+        if self.cache is not None:
+            self.cache.put(key, translated_text, target_language, self.model)
+        return translated_text, False
+
+    def translate_segments(self, segments, target_language, max_workers=4):
+        """
+        Translate segments concurrently. Identical segments are translated
+        once. Returns (translated_text, cached) pairs in segment order.
+        """
+        unique = list(dict.fromkeys(segments))
+        if len(unique) == 1:
+            results = {unique[0]: self.translate(unique[0], target_language)}
+        else:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(unique))) as executor:
+                results = dict(zip(unique, executor.map(lambda segment: self.translate(segment, target_language), unique)))
+        return [results[segment] for segment in segments]
+
+class AsyncTranslator(Translator):
+    """
+    Translator for an AsyncOpenAI client. The translation cache is shared
+    with the sync translator; its lookups run in worker threads.
+    """
+
+    async def translate(self, text, target_language):
+        """Translate one piece of text. Returns (translated_text, cached)."""
+        key = TranslationCache.make_key(text, target_language, self.model)
+        if self.cache is not None:
+            translated_text = await asyncio.to_thread(self.cache.get, key)
+            if translated_text is not None:
+                return translated_text, True
+
+        response = await self.client.chat.completions.create(
+            model=self.model,
+            messages=self._messages(text, target_language)
+        )
+        translated_text = response.choices[0].message.content
+
+        if self.cache is not None:
+            await asyncio.to_thread(self.cache.put, key, translated_text, target_language, self.model)
+        return translated_text, False
+
+    async def translate_segments(self, segments, target_language, max_concurrency=100):
+        """
+        Translate segments with at most max_concurrency requests in flight.
+        Identical segments are translated once. Returns (translated_text,
+        cached) pairs in segment order.
+        """
+        unique = list(dict.fromkeys(segments))
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def translate(segment):
+            async with semaphore:
+                return await self.translate(segment, target_language)
+
+        results = dict(zip(unique, await asyncio.gather(*(translate(segment) for segment in unique))))
+        return [results[segment] for segment in segments]
+
+def join_segments(text, segments, translations):
+    """
+    Reassemble translated segments, keeping the whitespace that separated
+    the original segments in text (a single space where it cannot be found)
+    """
+    parts = []
+    position = 0
+    for index, (segment, translation) in enumerate(zip(segments, translations)):
+        start = text.find(segment, position)
+        if index > 0:
+            gap = text[position:start] if start >= 0 else " "
+            parts.append(gap if not gap.strip() else " ")
+        if start >= 0:
+            position = start + len(segment)
+        parts.append(translation)
+    return "".join(parts)
+
+def init_translation_cache(app):
+    """Initialize the translation cache, persisting to MongoDB when available"""
+    global translation_cache
+
+    if not app.config['TRANSLATION_CACHE_ENABLED']:
+        logger.info("Translation cache disabled")
+        translation_cache = None
+        return
+
+    db = get_db()
+    try:
+        translation_cache = TranslationCache(
+            db['translations'] if db is not None else None,
+            app.config['TRANSLATION_CACHE_MAX_ENTRIES'],
+            app.config['TRANSLATION_CACHE_TTL_SECONDS']
+        )
+    except Exception as e:
+        logger.error(f"Error initializing MongoDB translation cache, using memory only: {str(e)}")
+        translation_cache = TranslationCache(None, app.config['TRANSLATION_CACHE_MAX_ENTRIES'],
+                                             app.config['TRANSLATION_CACHE_TTL_SECONDS'])
+
+def get_translation_cache():
+    """Get the translation cache instance (None when disabled)"""
+    return translation_cache
@@ -0,0 +1,175 @@
+import os
+import json
+import uuid
+import shutil
+import hashlib
+import logging
+import threading
+import unicodedata
+from collections import OrderedDict
+
+# Application-wide TTS result cache
+tts_cache = None
+
+logger = logging.getLogger(__name__)
+
+def _link_or_copy(source_path, target_path):
+    """Hard-link source to target, copying when links are not supported"""
+    try:
+        os.link(source_path, target_path)
+    except OSError:
+        shutil.copyfile(source_path, target_path)
+
+class TTSCache:
+    """
+    Content-addressed disk cache of synthesized MP3s with LRU eviction.
+    Entries are keyed by a hash of the normalized text and synthesis settings.
+    Cached files are hard-linked to a fresh filename on every hit, so evicting
+    a cache entry never removes audio that a podcast already references.
+    """
+
+    def __init__(self, cache_dir, max_bytes, max_entries=0):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()  # key -> size in bytes, least recently used first
+        self._size = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(cache_dir, exist_ok=True)
+        self._load()
+
+    @staticmethod
+    def make_key(text, voice, tone, is_chinese, model):
+        """Hash the normalized text together with every setting that affects the audio"""
+        normalized = " ".join(unicodedata.normalize("NFC", text).split())
+        payload = json.dumps([normalized, voice, tone, bool(is_chinese), model], ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.mp3")
+
+    def _load(self):
+        """Rebuild the in-memory index from the cache directory, oldest first"""
+        files = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.is_file() and entry.name.endswith(".mp3"):
+                stat = entry.stat()
+                files.append((stat.st_mtime, entry.name[:-4], stat.st_size))
+
+        with self._lock:
+            for _, key, size in sorted(files):
+                self._entries[key] = size
+                self._size += size
+            self._evict()
+        logger.info(f"TTS cache loaded {len(self._entries)} entries ({self._size} bytes) from {self.cache_dir}")
+
+    def _evict(self):
+        """Drop least recently used entries until within limits (caller holds the lock)"""
+        while self._entries and (self._size > self.max_bytes or
+                                 (self.max_entries and len(self._entries) > self.max_entries)):
+            key, size = self._entries.popitem(last=False)
+            self._size -= size
+            self.evictions += 1
+            try:
+                os.remove(self._path(key))
+            except OSError as e:
+                logger.warning(f"Error removing evicted TTS cache entry {key}: {str(e)}")
+
+    def _discard(self, key):
+        """Forget an entry whose file has disappeared (caller holds the lock)"""
+        size = self._entries.pop(key, None)
+        if size is not None:
+            self._size -= size
+
+    def get(self, key, output_path):
+        """Place the cached audio for key at output_path. Returns True on a hit."""
+        path = self._path(key)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+            elif os.path.exists(path):
+                # Written by another worker process sharing the directory
+                self._entries[key] = os.path.getsize(path)
+                self._size += self._entries[key]
+                self._evict()
+                if key not in self._entries:
+                    self.misses += 1
+                    return False
+            else:
+                self.misses += 1
+                return False
+
+        try:
+            _link_or_copy(path, output_path)
+            os.utime(path)  # Persist recency for the next startup
+        except OSError:
+            with self._lock:
+                self._discard(key)
+                self.misses += 1
+            return False
+
+        with self._lock:
+            self.hits += 1
+        return True
+
+    def put(self, key, source_path):
+        """Store the audio at source_path under key"""
+        path = self._path(key)
+        tmp_path = f"{path}.{uuid.uuid4()}.tmp"
+        try:
+            _link_or_copy(source_path, tmp_path)
+            os.replace(tmp_path, path)
+            size = os.path.getsize(path)
+        except OSError as e:
+            logger.error(f"Error adding TTS cache entry {key}: {str(e)}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+
+        with self._lock:
+            self._discard(key)
+            self._entries[key] = size
+            self._size += size
+            self._evict()
+
+    def stats(self):
+        """Return hit/miss counters and current usage"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "size_bytes": self._size,
+                "max_bytes": self.max_bytes,
+                "max_entries": self.max_entries
+            }
+
+def init_tts_cache(app):
+    """Initialize the TTS result cache"""
+    global tts_cache
+
+    if not app.config['TTS_CACHE_ENABLED']:
+        logger.info("TTS cache disabled")
+        tts_cache = None
+        return
+
+    try:
+        tts_cache = TTSCache(
+            app.config['TTS_CACHE_DIR'],
+            app.config['TTS_CACHE_MAX_BYTES'],
+            app.config['TTS_CACHE_MAX_ENTRIES']
+        )
+    except Exception as e:
+        logger.error(f"Error initializing TTS cache: {str(e)}")
+        tts_cache = None
+
+def get_tts_cache():
+    """Get the TTS cache instance (None when disabled)"""
+    return tts_cache
@@ -0,0 +1,95 @@
+import json
+from datetime import timezone
+from flask import Response, request
+from werkzeug.http import is_resource_modified
+
+# Bytes read per iteration when streaming a file-like object
+STREAM_CHUNK_SIZE = 255 * 1024
+
+def _utc(value):
+    """Normalize a datetime to second-resolution UTC, as sent in HTTP dates"""
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).replace(microsecond=0)
+
+def set_cache_headers(response, etag=None, last_modified=None, max_age=None):
+    """Attach validators and, for immutable content, a long-lived Cache-Control"""
+    if etag:
+        response.set_etag(etag)
+    if last_modified is not None:
+        response.last_modified = last_modified
+    if max_age:
+        response.cache_control.public = True
+        response.cache_control.max_age = max_age
+        response.cache_control.immutable = True
+    return response
+
+def _range_applies(etag, last_modified):
+    """A Range is only honoured if If-Range (when sent) still matches the resource"""
+    if_range = request.if_range
+    if if_range.etag is not None:
+        return if_range.etag == etag
+    if if_range.date is not None:
+        return last_modified is not None and _utc(if_range.date) >= _utc(last_modified)
+    return True
+
+def send_seekable(fileobj, length, mimetype, etag=None, last_modified=None, max_age=None,
+                  chunk_size=STREAM_CHUNK_SIZE):
+    """
+    Stream a seekable file-like object of known length, honouring a single
+    HTTP byte range (206) and rejecting unsatisfiable ones (416).
+    Multi-range requests are answered with the whole body. When etag or
+    last_modified is given, matching conditional requests get a 304.
+    """
+    last_modified = _utc(last_modified)
+    if (etag or last_modified) and not is_resource_modified(
+            request.environ, etag=etag, last_modified=last_modified):
+        fileobj.close()
+        return set_cache_headers(Response(status=304), etag, last_modified, max_age)
+
+    start, stop = 0, length
+    status = 200
+    byte_range = request.range
+    if byte_range is not None and len(byte_range.ranges) == 1 and _range_applies(etag, last_modified):
+        bounds = byte_range.range_for_length(length)
+        if bounds is None:
+            fileobj.close()
+            response = Response(status=416)
+            response.headers['Content-Range'] = f"bytes */{length}"
+            response.headers['Accept-Ranges'] = 'bytes'
+            return response
+        start, stop = bounds
+        status = 206
+
+    def generate():
+        try:
+            fileobj.seek(start)
+            remaining = stop - start
+            while remaining > 0:
+                data = fileobj.read(min(chunk_size, remaining))
+                if not data:
+                    break
+                remaining -= len(data)
+                yield data
+        finally:
+            fileobj.close()
+
+    response = Response(generate(), status=status, mimetype=mimetype, direct_passthrough=True)
+    response.headers['Content-Length'] = str(stop - start)
+    response.headers['Accept-Ranges'] = 'bytes'
+    if status == 206:
+        response.headers['Content-Range'] = f"bytes {start}-{stop - 1}/{length}"
+    return set_cache_headers(response, etag, last_modified, max_age)
+
+def sse_event(event, data, event_id=None, retry=None):
+    """Format one Server-Sent Event with a JSON payload and optional reconnect delay (ms)"""
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    if retry is not None:
+        lines.append(f"retry: {retry}")
+    lines.append(f"event: {event}")
+    lines.append(f"data: {json.dumps(data, ensure_ascii=False)}")
+    return "\n".join(lines) + "\n\n"
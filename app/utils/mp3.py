@@ -0,0 +1,157 @@
+import os
+from collections import namedtuple
+
+# Bitrates in kbps indexed by [version group][layer][bitrate index]
+BITRATES = {
+    'V1': {
+        1: [0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448],
+        2: [0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384],
+        3: [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    },
+    'V2': {
+        1: [0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256],
+        2: [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+        3: [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+    },
+}
+
+# Sample rates in Hz indexed by [MPEG version][sample rate index]
+SAMPLE_RATES = {
+    1: [44100, 48000, 32000],
+    2: [22050, 24000, 16000],
+    2.5: [11025, 12000, 8000],
+}
+
+# How far past the ID3 tag to look for the first frame
+MAX_SYNC_SEARCH = 64 * 1024
+
+FrameHeader = namedtuple('FrameHeader', [
+    'version', 'layer', 'bitrate', 'sample_rate', 'padding', 'channel_mode', 'frame_length'
+])
+
+Mp3Info = namedtuple('Mp3Info', [
+    'version', 'layer', 'sample_rate', 'channels', 'data_start', 'data_end'
+])
+
+def parse_frame_header(header):
+    """Parse a 4 byte MPEG audio frame header, returning None if it is not valid"""
+    if len(header) < 4 or header[0] != 0xFF or (header[1] & 0xE0) != 0xE0:
+        return None
+
+    version_bits = (header[1] >> 3) & 0x03
+    layer_bits = (header[1] >> 1) & 0x03
+    bitrate_index = header[2] >> 4
+    sample_rate_index = (header[2] >> 2) & 0x03
+
+    # Reserved version/layer/sample rate, and free or bad bitrate are not supported
+    if version_bits == 1 or layer_bits == 0 or sample_rate_index == 3 or bitrate_index in (0, 15):
+        return None
+
+    version = {0: 2.5, 2: 2, 3: 1}[version_bits]
+    layer = 4 - layer_bits
+    bitrate = BITRATES['V1' if version == 1 else 'V2'][layer][bitrate_index] * 1000
+    sample_rate = SAMPLE_RATES[version][sample_rate_index]
+    padding = (header[2] >> 1) & 0x01
+    channel_mode = header[3] >> 6
+
+    if layer == 1:
+        frame_length = (12 * bitrate // sample_rate + padding) * 4
+    elif layer == 3 and version != 1:
+        frame_length = 72 * bitrate // sample_rate + padding
+    else:
+        frame_length = 144 * bitrate // sample_rate + padding
+
+    return FrameHeader(version, layer, bitrate, sample_rate, padding, channel_mode, frame_length)
+
+def _id3v2_size(data):
+    """Size of an ID3v2 tag at the start of data, or 0"""
+    if len(data) < 10 or data[:3] != b'ID3':
+        return 0
+    size = (data[6] << 21) | (data[7] << 14) | (data[8] << 7) | data[9]
+    footer = 10 if data[5] & 0x10 else 0
+    return 10 + size + footer
+
+def _is_vbr_info_frame(frame, header):
+    """Check whether a frame only carries a Xing/Info/VBRI header rather than audio"""
+    mono = header.channel_mode == 3
+    if header.version == 1:
+        side_info = 17 if mono else 32
+    else:
+        side_info = 9 if mono else 17
+    xing_offset = 4 + side_info
+    return (frame[xing_offset:xing_offset + 4] in (b'Xing', b'Info') or
+            frame[36:40] == b'VBRI')
+
+def read_mp3_info(path):
+    """
+    Locate the MPEG audio frames in an MP3 file without decoding it.
+    Skips ID3v2/ID3v1 tags and a leading Xing/Info/VBRI frame.
+    Returns None if no valid frame sequence is found.
+    """
+    file_size = os.path.getsize(path)
+    with open(path, 'rb') as f:
+        head = f.read(10)
+        offset = _id3v2_size(head)
+        f.seek(offset)
+        window = f.read(MAX_SYNC_SEARCH)
+
+        # Find the first header that is followed by another valid header
+        for i in range(len(window) - 3):
+            header = parse_frame_header(window[i:i + 4])
+            if header is None:
+                continue
+            next_start = i + header.frame_length
+            if next_start + 4 <= len(window):
+                next_header = parse_frame_header(window[next_start:next_start + 4])
+                if next_header is None or next_header.sample_rate != header.sample_rate:
+                    continue
+            elif offset + next_start != file_size:
+                continue
+            break
+        else:
+            return None
+
+        data_start = offset + i
+        if _is_vbr_info_frame(window[i:i + header.frame_length], header):
+            data_start += header.frame_length
+
+        data_end = file_size
+        if file_size - data_start >= 128:
+            f.seek(file_size - 128)
+            if f.read(3) == b'TAG':
+                data_end -= 128
+
+    # Stereo modes may change from frame to frame, so only the channel count matters
+    channels = 1 if header.channel_mode == 3 else 2
+    return Mp3Info(header.version, header.layer, header.sample_rate, channels,
+                   data_start, data_end)
+
+def merge_mp3_frames(paths, output_path, buffer_size=64 * 1024):
+    """
+    Concatenate the audio frames of MP3 files into output_path without decoding.
+    Only works when every file shares MPEG version, layer, sample rate and
+    channel count. Returns False, writing nothing, if they do not.
+    Runs in O(total bytes) with a fixed size buffer.
+    """
+    infos = [read_mp3_info(path) for path in paths]
+    if not infos or any(info is None for info in infos):
+        return False
+
+    first = infos[0]
+    for info in infos[1:]:
+        if (info.version, info.layer, info.sample_rate, info.channels) != \
+                (first.version, first.layer, first.sample_rate, first.channels):
+            return False
+
+    with open(output_path, 'wb') as out:
+        for path, info in zip(paths, infos):
+            with open(path, 'rb') as f:
+                f.seek(info.data_start)
+                remaining = info.data_end - info.data_start
+                while remaining > 0:
+                    data = f.read(min(buffer_size, remaining))
+                    if not data:
+                        break
+                    out.write(data)
+                    remaining -= len(data)
+    return True
@@ -0,0 +1,44 @@
+import time
+import asyncio
+import threading
+
+class RateLimiter:
+    """Thread-safe token bucket allowing `rate` calls per `period` seconds"""
+
+    def __init__(self, rate, period=60.0, burst=None):
+        self.capacity = burst or rate
+        self.fill_rate = rate / period
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        """Add tokens earned since the last update (caller holds the lock)"""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.fill_rate)
+        self.updated = now
+
+    def _try_acquire(self):
+        """Take a token if one is available; otherwise return the seconds until one will be"""
+        with self._lock:
+            self._refill()
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0.0
+            return (1 - self.tokens) / self.fill_rate
+
+    def acquire(self):
+        """Block until a call is allowed"""
+        while True:
+            wait = self._try_acquire()
+            if not wait:
+                return
+            time.sleep(wait)
+
+    async def acquire_async(self):
+        """Wait until a call is allowed without blocking the event loop"""
+        while True:
+            wait = self._try_acquire()
+            if not wait:
+                return
+            await asyncio.sleep(wait)
@@ -0,0 +1,129 @@
+#!/usr/bin/env python
+"""
+Benchmark for AudioProcessor.chunk_text
+
+Compares the single-pass chunker against the previous implementation, which
+re-encoded the whole text, every sentence, every word of oversized sentences
+and every finished chunk.
+"""
+
+import re
+import sys
+import time
+import random
+import logging
+import argparse
+import tiktoken
+from app.services.audio_processor import AudioProcessor
+from app.services.tokenizer import count_tokens
+from app.config.config import Config
+
+WORDS = [
+    "the", "podcast", "listener", "article", "extension", "synthesis",
+    "chunk", "token", "boundary", "sentence", "paragraph", "voice",
+    "translation", "latency", "throughput", "server", "browser", "audio",
+]
+
+
+def legacy_chunk_text(text, max_tokens=2000, model="gpt-4o"):
+    """The previous chunker, kept here as the baseline"""
+    def num_tokens_from_string(string):
+        encoding = tiktoken.encoding_for_model(model)
+        return len(encoding.encode(string))
+
+    if num_tokens_from_string(text) <= max_tokens:
+        return [text]
+
+    chunks = []
+    current_chunk = ""
+    current_tokens = 0
+
+    for sentence in re.split(r'(?<=[.!?])\s+', text):
+        sentence_tokens = num_tokens_from_string(sentence)
+        if sentence_tokens > max_tokens:
+            if current_chunk:
+                chunks.append(current_chunk.strip())
+                current_chunk = ""
+                current_tokens = 0
+            sub_chunk = ""
+            sub_tokens = 0
+            for word in sentence.split(' '):
+                word_tokens = num_tokens_from_string(word + " ")
+                if sub_tokens + word_tokens <= max_tokens:
+                    sub_chunk += word + " "
+                    sub_tokens += word_tokens
+                else:
+                    if sub_chunk:
+                        chunks.append(sub_chunk.strip())
+                    sub_chunk = word + " "
+                    sub_tokens = word_tokens
+            if sub_chunk:
+                current_chunk = sub_chunk
+                current_tokens = sub_tokens
+        elif current_tokens + sentence_tokens > max_tokens:
+            if current_chunk:
+                chunks.append(current_chunk.strip())
+            current_chunk = sentence
+            current_tokens = sentence_tokens
+        else:
+            current_chunk += " " + sentence if current_chunk else sentence
+            current_tokens += sentence_tokens
+
+    if current_chunk:
+        chunks.append(current_chunk.strip())
+
+    for chunk in chunks:
+        num_tokens_from_string(chunk)
+
+    return chunks
+
+
+def generate_article(num_words, seed=42):
+    """Generate a synthetic article of roughly num_words words"""
+    rng = random.Random(seed)
+    sentences = []
+    remaining = num_words
+    while remaining > 0:
+        length = min(remaining, rng.randint(5, 40))
+        words = [rng.choice(WORDS) for _ in range(length)]
+        sentences.append(" ".join(words).capitalize() + rng.choice([".", "!", "?"]))
+        remaining -= length
+    return " ".join(sentences)
+
+
+def time_call(func, repeat):
+    """Return the best wall-clock time of repeat calls and the last result"""
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark AudioProcessor.chunk_text on large inputs')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 50000, 100000],
+                        help='Article sizes to test, in words')
+    parser.add_argument('--max-tokens', type=int, default=Config.MAX_TOKEN_LENGTH, help='Chunk size in tokens')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per measurement (best is reported)')
+    args = parser.parse_args()
+
+    # Per-chunk logging would dominate the timings
+    logging.disable(logging.INFO)
+
+    processor = AudioProcessor(None, Config.TONE_INSTRUCTIONS)
+
+    print(f"{'words':>8} {'tokens':>8} {'legacy (s)':>11} {'single-pass (s)':>16} {'speedup':>8} {'chunks':>7}")
+    for size in args.sizes:
+        text = generate_article(size)
+        tokens = count_tokens(text)
+        legacy_time, legacy_chunks = time_call(lambda: legacy_chunk_text(text, args.max_tokens), args.repeat)
+        new_time, new_chunks = time_call(lambda: processor.chunk_text(text, args.max_tokens), args.repeat)
+        print(f"{size:>8} {tokens:>8} {legacy_time:>11.3f} {new_time:>16.3f} "
+              f"{legacy_time / new_time:>7.1f}x {len(new_chunks):>3}/{len(legacy_chunks):<3}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
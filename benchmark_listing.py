@@ -0,0 +1,60 @@
+#!/usr/bin/env python
+"""
+Benchmark for podcast listing queries
+
+Compares fetching list pages with no projection (the old behaviour, which
+pulls embedded audio_data blobs) against the named listing projection,
+reporting bytes transferred and latency per page.
+"""
+
+import sys
+import time
+import argparse
+import statistics
+from pymongo import MongoClient
+from bson.codec_options import CodecOptions
+from bson.raw_bson import RawBSONDocument
+from app.config.config import Config
+from app.services.database import LIST_SORT, LISTING_PROJECTION
+
+def measure(collection, projection, pages, per_page):
+    """Fetch pages as raw BSON and return (bytes per page, seconds per page)"""
+    sizes = []
+    latencies = []
+    for page in range(pages):
+        start = time.perf_counter()
+        cursor = collection.find({}, projection).sort(LIST_SORT).skip(page * per_page).limit(per_page)
+        size = sum(len(doc.raw) for doc in cursor)
+        latencies.append(time.perf_counter() - start)
+        sizes.append(size)
+    return statistics.mean(sizes), statistics.median(latencies)
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark podcast listing with and without projections')
+    parser.add_argument('--pages', type=int, default=10, help='Number of pages to fetch')
+    parser.add_argument('--per-page', type=int, default=10, help='Records per page')
+    args = parser.parse_args()
+
+    mongo_uri = f"mongodb://{Config.MONGODB_USER}:{Config.MONGODB_PASSWORD}@{Config.MONGODB_HOST}:{Config.MONGODB_PORT}/"
+    client = MongoClient(mongo_uri)
+    raw_options = CodecOptions(document_class=RawBSONDocument)
+    collection = client[Config.MONGODB_DB].get_collection("podcasts", codec_options=raw_options)
+
+    total = collection.estimated_document_count()
+    with_audio = collection.count_documents({"audio_data": {"$exists": True}})
+    print(f"Collection: {total} records, {with_audio} with embedded audio_data")
+
+    print(f"{'query':<22} {'bytes/page':>14} {'median ms/page':>16}")
+    results = {}
+    for name, projection in (("no projection", None), ("listing projection", LISTING_PROJECTION)):
+        size, latency = measure(collection, projection, args.pages, args.per_page)
+        results[name] = (size, latency)
+        print(f"{name:<22} {size:>14,.0f} {latency * 1000:>16.2f}")
+
+    full_size, full_latency = results["no projection"]
+    listing_size, listing_latency = results["listing projection"]
+    if listing_size and listing_latency:
+        print(f"Reduction: {full_size / listing_size:.1f}x fewer bytes, {full_latency / listing_latency:.1f}x faster")
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,50 @@
+#!/usr/bin/env python
+"""
+Index check for the podcasts collection
+
+Creates any missing indexes declared in app/services/indexes.py, then runs
+explain() on each query shape the app and maintenance scripts use and flags
+those that fall back to a collection scan. Exits with status 1 if any do.
+"""
+
+import sys
+import argparse
+from pymongo import MongoClient
+from app.config.config import Config
+from app.services.indexes import ensure_indexes, explain_queries
+
+def main():
+    parser = argparse.ArgumentParser(description='Check the query plans of the podcasts collection')
+    parser.add_argument('--no-create', action='store_true', help='Only explain queries, do not create missing indexes')
+    args = parser.parse_args()
+
+    try:
+        mongo_uri = f"mongodb://{Config.MONGODB_USER}:{Config.MONGODB_PASSWORD}@{Config.MONGODB_HOST}:{Config.MONGODB_PORT}/"
+        client = MongoClient(mongo_uri)
+        collection = client[Config.MONGODB_DB]["podcasts"]
+        client.admin.command('ping')
+    except Exception as e:
+        print(f"Error connecting to MongoDB: {str(e)}")
+        sys.exit(1)
+
+    if not args.no_create:
+        created = ensure_indexes(collection)
+        print(f"Created indexes: {', '.join(created)}" if created else "All declared indexes exist")
+
+    print(f"\n{'Query':<32} {'Plan':<28} {'Index':<26} {'Examined':>8}")
+    print("-" * 98)
+    scans = 0
+    for result in explain_queries(collection):
+        flag = "  <-- COLLSCAN" if result['collscan'] else ""
+        scans += result['collscan']
+        examined = result['docs_examined'] if result['docs_examined'] is not None else '-'
+        print(f"{result['name']:<32} {' > '.join(result['stages'])[:28]:<28} "
+              f"{', '.join(result['indexes']) or '-':<26} {examined:>8}{flag}")
+
+    if scans:
+        print(f"\n{scans} query shape(s) fall back to a collection scan")
+        sys.exit(1)
+    print("\nAll query shapes use an index")
+
+if __name__ == "__main__":
+    main()
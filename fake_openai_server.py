@@ -0,0 +1,139 @@
+#!/usr/bin/env python
+"""
+Fake OpenAI API server for local testing
+
+Mimics the speech (/v1/audio/speech) and chat (/v1/chat/completions)
+endpoints used by Podcast Maker so the app can be exercised without an
+API key or network access. Point the app at it with:
+
+    OPENAI_BASE_URL=http://localhost:8089/v1 OPENAI_API_KEY=fake python run.py
+"""
+
+import sys
+import json
+import time
+import random
+import logging
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Configure logging
+logging.basicConfig(level=logging.INFO,
+                    format='[%(asctime)s] [%(levelname)s] %(message)s',
+                    datefmt='%Y-%m-%d %H:%M:%S')
+logger = logging.getLogger(__name__)
+
+# MPEG-1 Layer III, 128 kbps, 44.1 kHz, no padding: 417 byte frames of silence
+MP3_FRAME_HEADER = bytes([0xFF, 0xFB, 0x90, 0x64])
+MP3_FRAME_SIZE = 417
+
+def silent_mp3(num_frames):
+    """Build a silent MP3 made of num_frames identical frames"""
+    frame = MP3_FRAME_HEADER + bytes(MP3_FRAME_SIZE - len(MP3_FRAME_HEADER))
+    return frame * num_frames
+
+class FakeOpenAIHandler(BaseHTTPRequestHandler):
+    """Request handler emulating the OpenAI endpoints used by the app"""
+    protocol_version = "HTTP/1.1"  # Keep-alive, so connection reuse is observable
+
+    # Shared server settings and counters, set in main()
+    latency = 0.0
+    fail_rate = 0.0
+    stats = {"connections": 0, "speech": 0, "chat": 0, "failures": 0}
+    stats_lock = threading.Lock()
+
+    def setup(self):
+        super().setup()
+        with self.stats_lock:
+            self.stats["connections"] += 1
+
+    def log_message(self, format, *args):
+        logger.info(f"{self.client_address[0]} {format % args}")
+
+    def _read_json(self):
+        length = int(self.headers.get('Content-Length', 0))
+        body = self.rfile.read(length) if length else b'{}'
+        return json.loads(body or b'{}')
+
+    def _send(self, status, body, content_type):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, status, data):
+        self._send(status, json.dumps(data).encode('utf-8'), 'application/json')
+
+    def _maybe_fail(self):
+        """Fail with a retryable 503 at the configured rate"""
+        if random.random() < self.fail_rate:
+            with self.stats_lock:
+                self.stats["failures"] += 1
+            self._send_json(503, {"error": {"message": "Simulated overload", "type": "server_error"}})
+            return True
+        return False
+
+    def do_POST(self):
+        data = self._read_json()
+        time.sleep(self.latency)
+        if self._maybe_fail():
+            return
+
+        if self.path.endswith('/audio/speech'):
+            with self.stats_lock:
+                self.stats["speech"] += 1
+            # Roughly one frame per character keeps file size proportional to input
+            audio = silent_mp3(max(1, len(data.get('input', ''))))
+            self._send(200, audio, 'audio/mpeg')
+        elif self.path.endswith('/chat/completions'):
+            with self.stats_lock:
+                self.stats["chat"] += 1
+            user_text = next((m['content'] for m in reversed(data.get('messages', []))
+                              if m.get('role') == 'user'), '')
+            self._send_json(200, {
+                "id": f"chatcmpl-fake-{self.stats['chat']}",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": data.get('model', 'gpt-4o'),
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": f"[translated] {user_text}"},
+                    "finish_reason": "stop"
+                }],
+                "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
+            })
+        else:
+            self._send_json(404, {"error": {"message": f"Unknown path {self.path}"}})
+
+    def do_GET(self):
+        if self.path == '/stats':
+            with self.stats_lock:
+                self._send_json(200, dict(self.stats))
+        else:
+            self._send_json(404, {"error": {"message": f"Unknown path {self.path}"}})
+
+def main():
+    parser = argparse.ArgumentParser(description='Run a fake OpenAI speech/chat server')
+    parser.add_argument('--host', default='localhost', help='Interface to bind')
+    parser.add_argument('--port', type=int, default=8089, help='Port to listen on')
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds to wait before each response')
+    parser.add_argument('--fail-rate', type=float, default=0.0, help='Fraction of requests answered with 503')
+    args = parser.parse_args()
+
+    FakeOpenAIHandler.latency = args.latency
+    FakeOpenAIHandler.fail_rate = args.fail_rate
+
+    server = ThreadingHTTPServer((args.host, args.port), FakeOpenAIHandler)
+    logger.info(f"Fake OpenAI server listening on http://{args.host}:{args.port}/v1 (stats at /stats)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        logger.info(f"Final stats: {FakeOpenAIHandler.stats}")
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,65 @@
+"""
+Gunicorn configuration for Podcast Maker
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+Every setting can be overridden with an environment variable. Send HUP to
+the master for a graceful reload of the workers (with GUNICORN_PRELOAD the
+application code is only re-read on a full restart).
+"""
+
+import os
+import sys
+import multiprocessing
+
+# The app is loaded in the master, but connections, pools and worker threads
+# are created per worker in post_fork (see wsgi.py)
+os.environ['DEFER_SERVICE_INIT'] = '1'
+
+# The master rebuilds the audio index once (when_ready); workers only open it
+os.environ.setdefault('AUDIO_INDEX_REBUILD_ON_START', 'false')
+
+bind = os.environ.get('GUNICORN_BIND', f"0.0.0.0:{os.environ.get('PORT', 9090)}")
+
+# Threaded workers: requests mostly wait on OpenAI and MongoDB, and SSE/NDJSON
+# streams hold a thread each for their whole duration
+worker_class = 'gthread'
+workers = int(os.environ.get('GUNICORN_WORKERS', min(multiprocessing.cpu_count() * 2 + 1, 8)))
+threads = int(os.environ.get('GUNICORN_THREADS', 8))
+
+# Recycle workers after this many requests (jitter avoids restarting them all at once)
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 1000))
+max_requests_jitter = int(os.environ.get('GUNICORN_MAX_REQUESTS_JITTER', 100))
+
+# Long syntheses must not be killed; in-flight requests get time to finish on reload/shutdown
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 180))
+graceful_timeout = int(os.environ.get('GUNICORN_GRACEFUL_TIMEOUT', 30))
+keepalive = int(os.environ.get('GUNICORN_KEEPALIVE', 5))
+
+# Import the app (routes, templates, token encodings) once and share it copy-on-write
+preload_app = os.environ.get('GUNICORN_PRELOAD', 'true').lower() == 'true'
+
+accesslog = os.environ.get('GUNICORN_ACCESS_LOG', '-')
+errorlog = '-'
+
+def on_starting(server):
+    """Refuse to run several workers with per-process job storage"""
+    if server.cfg.workers > 1 and os.environ.get('JOB_STORE', 'memory') != 'mongodb':
+        # Job status and events would 404 on every worker but the one that ran the job
+        sys.exit(f"JOB_STORE must be 'mongodb' with {server.cfg.workers} workers "
+                 f"(or set GUNICORN_WORKERS=1)")
+
+def when_ready(server):
+    """Bring the audio index up to date once, before the workers start"""
+    from app.services.audio_index import rebuild_audio_index
+    from wsgi import app
+    rebuild_audio_index(app)
+
+def post_fork(server, worker):
+    """Create this worker's MongoDB client, HTTP pool, audio index and job threads"""
+    from app import init_app_services
+    from wsgi import app
+    # Per-process limits such as TTS_REQUESTS_PER_MINUTE are split between the workers
+    app.config['SERVER_PROCESSES'] = server.cfg.workers
+    init_app_services(app)
+    server.log.info(f"Worker {worker.pid} initialized its services")
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Simple HTTP load test for comparing serving modes.
+
+Each thread keeps one keep-alive connection and issues GET requests in a
+loop for the given duration. Prints throughput, latency percentiles and
+errors, e.g. to compare `python run.py` with gunicorn:
+
+    python load_test.py --url http://localhost:9090 --concurrency 32 --duration 30
+"""
+
+import sys
+import time
+import argparse
+import threading
+import http.client
+from urllib.parse import urlsplit
+
+DEFAULT_PATHS = ['/podcast/list', '/api/test_connection']
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+def worker(host, port, scheme, paths, deadline, latencies, errors, lock):
+    """Issue requests round-robin over paths until the deadline"""
+    connection_class = http.client.HTTPSConnection if scheme == 'https' else http.client.HTTPConnection
+    connection = connection_class(host, port, timeout=30)
+    local_latencies = []
+    local_errors = 0
+    request_number = 0
+
+    while time.monotonic() < deadline:
+        path = paths[request_number % len(paths)]
+        request_number += 1
+        start = time.perf_counter()
+        try:
+            connection.request('GET', path)
+            response = connection.getresponse()
+            response.read()
+            if response.status >= 400:
+                local_errors += 1
+            else:
+                local_latencies.append(time.perf_counter() - start)
+            if response.will_close:
+                connection.close()
+        except Exception:
+            local_errors += 1
+            connection.close()
+
+    connection.close()
+    with lock:
+        latencies.extend(local_latencies)
+        errors[0] += local_errors
+
+def run(url, paths, concurrency, duration):
+    """Run the load test and return a summary dict"""
+    parts = urlsplit(url)
+    scheme = parts.scheme or 'http'
+    host = parts.hostname or 'localhost'
+    port = parts.port or (443 if scheme == 'https' else 80)
+    prefix = parts.path.rstrip('/')
+    paths = [prefix + path for path in paths]
+
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+    start = time.monotonic()
+    deadline = start + duration
+    threads = [
+        threading.Thread(target=worker, args=(host, port, scheme, paths, deadline, latencies, errors, lock))
+        for _ in range(concurrency)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.monotonic() - start
+
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'errors': errors[0],
+        'seconds': elapsed,
+        'requests_per_second': len(latencies) / elapsed if elapsed else 0.0,
+        'p50_ms': percentile(latencies, 0.50) * 1000,
+        'p95_ms': percentile(latencies, 0.95) * 1000,
+        'p99_ms': percentile(latencies, 0.99) * 1000
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='Load test the Podcast Maker server')
+    parser.add_argument('--url', default='http://localhost:9090', help='Base URL of the server')
+    parser.add_argument('--path', action='append', dest='paths',
+                        help=f"Path to request (repeatable, default: {' '.join(DEFAULT_PATHS)})")
+    parser.add_argument('--concurrency', type=int, default=16, help='Concurrent connections')
+    parser.add_argument('--duration', type=float, default=20, help='Seconds to run')
+    args = parser.parse_args()
+
+    paths = args.paths or DEFAULT_PATHS
+    print(f"Load testing {args.url} with {args.concurrency} connections for {args.duration:g}s: {', '.join(paths)}")
+    summary = run(args.url, paths, args.concurrency, args.duration)
+
+    print(f"Requests:   {summary['requests']} ({summary['errors']} errors)")
+    print(f"Throughput: {summary['requests_per_second']:.1f} req/s")
+    print(f"Latency:    p50 {summary['p50_ms']:.1f} ms, p95 {summary['p95_ms']:.1f} ms, p99 {summary['p99_ms']:.1f} ms")
+    return 1 if summary['errors'] and not summary['requests'] else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,119 @@
+#!/usr/bin/env python
+"""
+Move embedded audio out of podcast documents into GridFS
+
+Podcast records created by import_audio_to_mongodb.py used to store the
+whole MP3 as a Binary audio_data field. This script uploads each one to the
+GridFS audio bucket, then replaces audio_data with an audio_file_id
+reference. It is safe to re-run: records already migrated are skipped, and
+uploads left behind by an interrupted run are reused.
+"""
+
+import sys
+import time
+import argparse
+import logging
+from pymongo import MongoClient
+from gridfs import GridFSBucket
+from app.config.config import Config
+from app.services.indexes import ensure_indexes, AUDIO_FILE_INDEXES
+
+# Configure logging
+logging.basicConfig(level=logging.INFO,
+                    format='[%(asctime)s] [%(levelname)s] %(message)s',
+                    datefmt='%Y-%m-%d %H:%M:%S')
+logger = logging.getLogger(__name__)
+
+def connect_to_mongodb():
+    """Connect to the MongoDB database"""
+    try:
+        mongo_uri = f"mongodb://{Config.MONGODB_USER}:{Config.MONGODB_PASSWORD}@{Config.MONGODB_HOST}:{Config.MONGODB_PORT}/"
+        mongo_client = MongoClient(mongo_uri)
+        db = mongo_client[Config.MONGODB_DB]
+        mongo_client.admin.command('ping')
+        logger.info("Connected to MongoDB successfully")
+        return mongo_client, db
+    except Exception as e:
+        logger.error(f"Error connecting to MongoDB: {str(e)}")
+        return None, None
+
+def find_existing_upload(db, podcast_id):
+    """Find a GridFS file uploaded for this record by an interrupted run"""
+    existing = db[f"{Config.GRIDFS_AUDIO_BUCKET}.files"].find_one(
+        {'metadata.podcast_id': podcast_id}, {'_id': 1})
+    return existing['_id'] if existing else None
+
+def migrate(db, dry_run=False, batch_size=20, limit=0):
+    """Migrate every record with embedded audio_data to GridFS"""
+    collection = db['podcasts']
+    bucket = GridFSBucket(db, bucket_name=Config.GRIDFS_AUDIO_BUCKET)
+
+    query = {'audio_data': {'$exists': True}}
+    pending = collection.count_documents(query)
+    logger.info(f"{pending} records with embedded audio_data")
+    if dry_run or pending == 0:
+        return 0, 0
+
+    # find_existing_upload runs once per record
+    ensure_indexes(db[f"{Config.GRIDFS_AUDIO_BUCKET}.files"], AUDIO_FILE_INDEXES)
+
+    migrated = 0
+    bytes_moved = 0
+    start_time = time.monotonic()
+
+    # Small batches keep at most a few MP3s in memory at a time
+    cursor = collection.find(query, {'_id': 1, 'chunk_id': 1, 'audio_data': 1}).batch_size(batch_size)
+    if limit:
+        cursor = cursor.limit(limit)
+
+    for record in cursor:
+        podcast_id = record['_id']
+        audio_data = bytes(record['audio_data'])
+        filename = f"chunk_{record['chunk_id']}.mp3" if record.get('chunk_id') else f"{podcast_id}.mp3"
+
+        try:
+            file_id = find_existing_upload(db, podcast_id)
+            uploaded = file_id is None
+            if uploaded:
+                file_id = bucket.upload_from_stream(filename, audio_data, metadata={
+                    'podcast_id': podcast_id,
+                    'chunk_id': record.get('chunk_id'),
+                    'content_type': 'audio/mpeg'
+                })
+
+            result = collection.update_one(
+                {'_id': podcast_id, 'audio_data': {'$exists': True}},
+                {'$set': {'audio_file_id': file_id}, '$unset': {'audio_data': ''}}
+            )
+            if result.modified_count:
+                migrated += 1
+                bytes_moved += len(audio_data)
+            elif uploaded:
+                # Migrated concurrently by another run; drop our copy, but never
+                # a file found by find_existing_upload, which that run may have linked
+                bucket.delete(file_id)
+        except Exception as e:
+            logger.error(f"Error migrating record {podcast_id}: {str(e)}")
+
+        if migrated and migrated % 100 == 0:
+            logger.info(f"Migrated {migrated}/{pending} records ({bytes_moved / 1024 / 1024:.1f} MB)")
+
+    elapsed = time.monotonic() - start_time
+    logger.info(f"Migrated {migrated} records, {bytes_moved / 1024 / 1024:.1f} MB moved to GridFS in {elapsed:.1f}s")
+    return migrated, bytes_moved
+
+def main():
+    parser = argparse.ArgumentParser(description='Move embedded audio_data into GridFS')
+    parser.add_argument('--dry-run', action='store_true', help='Only report how many records would be migrated')
+    parser.add_argument('--batch-size', type=int, default=20, help='Records fetched per cursor batch')
+    parser.add_argument('--limit', type=int, default=0, help='Migrate at most this many records (0 = all)')
+    args = parser.parse_args()
+
+    client, db = connect_to_mongodb()
+    if db is None:
+        sys.exit(1)
+
+    migrate(db, dry_run=args.dry_run, batch_size=args.batch_size, limit=args.limit)
+
+if __name__ == "__main__":
+    main()
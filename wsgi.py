@@ -0,0 +1,17 @@
+"""
+WSGI entry point for production servers
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+gunicorn.conf.py sets DEFER_SERVICE_INIT so the app can be preloaded in the
+master process without opening MongoDB, SQLite or HTTP connections there;
+each worker creates its own in the post_fork hook.
+"""
+
+import os
+from app import create_app
+
+app = create_app(
+    os.environ.get('FLASK_ENV', 'production'),
+    init_services=os.environ.get('DEFER_SERVICE_INIT') != '1'
+)